@@ -0,0 +1,291 @@
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from normalize import SCHEMAS, guess_kind, iter_record_batches, to_arrow_table
+from review_parser import SUBRATING_KEYS
+
+DEFAULT_CACHE_DIR = '.analyze_cache'
+DEFAULT_BATCH_SIZE = 500_000
+# Bumped whenever the results change shape, so older memoized results are ignored
+ANALYSIS_VERSION = 1
+
+REVIEW_COLUMNS = ['date', 'rating', 'position', 'location', 'recommend', 'ceo_approval', *SUBRATING_KEYS]
+INTERVIEW_COLUMNS = ['interview_position', 'is_offer_received', 'interview_experience', 'interview_difficulty']
+ANSWERED = ['positive', 'neutral', 'negative']
+DIFFICULTY_SCORES = {'Easy interview': 1, 'Average interview': 2, 'Difficult interview': 3}
+OFFER_RECEIVED = ['Accepted offer', 'Declined offer']
+
+
+def _same_type(actual, expected):
+    # Parquet has no second resolution, so typed dates come back as ms
+    if pa.types.is_timestamp(expected):
+        return pa.types.is_timestamp(actual)
+    return actual == expected
+
+
+def _is_typed(schema, kind, columns):
+    expected = SCHEMAS[kind]
+    return all(name in schema.names and _same_type(schema.field(name).type, expected.field(name).type)
+               for name in columns)
+
+
+def iter_frames(path, kind, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yields typed DataFrames of `columns`, one record batch at a time. Typed
+    Parquet (see normalize.py) is read column-projected straight from disk;
+    other outputs are normalized batch by batch, which is much slower on
+    large corpora, so convert those once with normalize.py.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if os.path.isdir(path) or extension == '.parquet':
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(path, format='parquet')
+        if _is_typed(dataset.schema, kind, columns):
+            for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+                yield batch.to_pandas()
+            return
+    for records in iter_record_batches(path, batch_size):
+        yield to_arrow_table(kind, records).select(columns).to_pandas()
+
+
+def detect_kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if os.path.isdir(path) or extension == '.parquet':
+        import pyarrow.dataset as ds
+        return guess_kind(ds.dataset(path, format='parquet').schema.names)
+    if extension not in ('.jsonl', '.json'):
+        # The header tells the kind even when there are no rows
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), None)
+        return guess_kind(header or [])
+    for records in iter_record_batches(path, 1):
+        return guess_kind(records[0])
+    return 'reviews'
+
+
+def _empty_frame(kind, columns):
+    return to_arrow_table(kind, []).select(columns).to_pandas()
+
+
+def _combine(partials):
+    # Empty partials (e.g. every location missing) still have the columns, keep one
+    nonempty = [partial for partial in partials if len(partial)]
+    if not nonempty:
+        return partials[0]
+    return pd.concat(nonempty).groupby(level=0).sum()
+
+
+def review_partials(df):
+    """Sums and counts for one chunk of reviews; they add up across chunks."""
+    rating = df['rating']
+    month = df['date'].dt.to_period('M')
+    monthly = pd.DataFrame({
+        'reviews': 1,
+        'rating_sum': rating.fillna(0),
+        'rating_count': rating.notna().astype(np.int64),
+    }).groupby(month).sum()
+
+    subratings = df[list(SUBRATING_KEYS)].astype('float64')
+    subrating_sums = pd.DataFrame({'sum': subratings.sum(), 'count': subratings.count()})
+
+    counts = pd.DataFrame({
+        'reviews': 1,
+        'rating_sum': rating.fillna(0),
+        'rating_count': rating.notna().astype(np.int64),
+        'recommend_positive': (df['recommend'] == 'positive').astype(np.int64),
+        'recommend_answered': df['recommend'].isin(ANSWERED).astype(np.int64),
+        'ceo_positive': (df['ceo_approval'] == 'positive').astype(np.int64),
+        'ceo_answered': df['ceo_approval'].isin(ANSWERED).astype(np.int64),
+    })
+    by_location = counts.groupby(df['location'].astype(object), dropna=True).sum()
+    by_position = counts.groupby(df['position'].astype(object), dropna=True).sum()
+    return monthly, subrating_sums, by_location, by_position
+
+
+def _rates(frame, min_count):
+    frame = frame[frame['reviews'] >= min_count]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'reviews': frame['reviews'],
+            'mean_rating': frame['rating_sum'] / frame['rating_count'],
+            'recommend_rate': frame['recommend_positive'] / frame['recommend_answered'],
+            'ceo_approval_rate': frame['ceo_positive'] / frame['ceo_answered'],
+        }).sort_values('reviews', ascending=False)
+
+
+def analyze_reviews(frames, min_count=1):
+    # An input without rows yields no frames, its results are the empty tables
+    partials = [review_partials(df) for df in frames] or [review_partials(_empty_frame('reviews', REVIEW_COLUMNS))]
+    monthly, subratings, by_location, by_position = (_combine(parts) for parts in zip(*partials))
+    monthly = monthly.sort_index()
+    return {
+        'monthly_ratings': pd.DataFrame({
+            'reviews': monthly['reviews'],
+            'mean_rating': monthly['rating_sum'] / monthly['rating_count'],
+        }).rename_axis('month'),
+        'subratings': pd.DataFrame({
+            'mean': subratings['sum'] / subratings['count'],
+            'count': subratings['count'],
+        }).reindex(list(SUBRATING_KEYS)).rename_axis('subrating'),
+        'by_location': _rates(by_location, min_count).rename_axis('location'),
+        'by_position': _rates(by_position, min_count).rename_axis('position'),
+    }
+
+
+def interview_partials(df):
+    position = df['interview_position'].astype(object)
+    difficulty = df['interview_difficulty'].astype(object)
+    offer = df['is_offer_received'].astype(object)
+    counts = pd.DataFrame({
+        'interviews': 1,
+        'difficulty_sum': difficulty.map(DIFFICULTY_SCORES).fillna(0),
+        'difficulty_count': difficulty.isin(DIFFICULTY_SCORES).astype(np.int64),
+        'offers': offer.isin(OFFER_RECEIVED).astype(np.int64),
+        'accepted': (offer == 'Accepted offer').astype(np.int64),
+        'offer_answered': offer.notna().astype(np.int64),
+        'positive_experience': (df['interview_experience'] == 'Positive experience').astype(np.int64),
+        'experience_answered': df['interview_experience'].notna().astype(np.int64),
+    })
+    for label in DIFFICULTY_SCORES:
+        counts[label] = (difficulty == label).astype(np.int64)
+    return counts.groupby(position, dropna=True).sum(), counts.sum().to_frame('all').T
+
+
+def _interview_rates(frame):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = pd.DataFrame({
+            'interviews': frame['interviews'],
+            'mean_difficulty': frame['difficulty_sum'] / frame['difficulty_count'],
+            'offer_rate': frame['offers'] / frame['offer_answered'],
+            'acceptance_rate': frame['accepted'] / frame['offers'],
+            'positive_experience_rate': frame['positive_experience'] / frame['experience_answered'],
+        })
+        for label in DIFFICULTY_SCORES:
+            rates[label.split()[0].lower() + '_share'] = frame[label] / frame['difficulty_count']
+    return rates.sort_values('interviews', ascending=False)
+
+
+def analyze_interviews(frames, min_count=1):
+    partials = ([interview_partials(df) for df in frames]
+                or [interview_partials(_empty_frame('interviews', INTERVIEW_COLUMNS))])
+    by_position, overall = (_combine(parts) for parts in zip(*partials))
+    return {
+        'overall': _interview_rates(overall).rename_axis('scope'),
+        'by_position': _interview_rates(by_position[by_position['interviews'] >= min_count])
+        .rename_axis('position'),
+    }
+
+
+def input_digest(path, index_path=None):
+    """
+    SHA-256 of the input file, or of every file of a dataset directory.
+    Digests are remembered by path, size and mtime in `index_path`, so an
+    unchanged input is not hashed again.
+    """
+    files = ([os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+             if os.path.isdir(path) else [path])
+    files.sort()
+    signature = [[os.path.relpath(f, path) if os.path.isdir(path) else os.path.basename(f),
+                  os.path.getsize(f), os.stat(f).st_mtime_ns] for f in files]
+    key = os.path.abspath(path)
+    index = {}
+    if index_path and os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            index = json.load(f)
+    entry = index.get(key)
+    if entry and entry['signature'] == signature:
+        return entry['sha256']
+
+    digest = hashlib.sha256()
+    for file_path, _, _ in signature:
+        digest.update(file_path.encode('utf-8'))
+        with open(os.path.join(path, file_path) if os.path.isdir(path) else path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    sha256 = digest.hexdigest()
+    if index_path:
+        index[key] = {'signature': signature, 'sha256': sha256}
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    return sha256
+
+
+def _to_records(frame):
+    frame = frame.reset_index()
+    frame = frame.astype({name: str for name in frame.columns if isinstance(frame[name].dtype, pd.PeriodDtype)})
+    return json.loads(frame.to_json(orient='records'))
+
+
+def analyze(path, kind=None, min_count=1, cache_dir=DEFAULT_CACHE_DIR, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Aggregates of a scraper output as `{name: [row, ...]}`, memoized in
+    `cache_dir` by the SHA-256 of the input. Returns `(results, cached)`.
+    """
+    kind = kind or detect_kind(path)
+    cache_path = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        digest = input_digest(path, os.path.join(cache_dir, 'index.json'))
+        cache_path = os.path.join(cache_dir, f'{kind}-v{ANALYSIS_VERSION}-min{min_count}-{digest}.json')
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding='utf-8') as f:
+                return json.load(f), True
+
+    if kind == 'reviews':
+        tables = analyze_reviews(iter_frames(path, kind, REVIEW_COLUMNS, batch_size), min_count)
+    else:
+        tables = analyze_interviews(iter_frames(path, kind, INTERVIEW_COLUMNS, batch_size), min_count)
+    results = {'kind': kind, 'tables': {name: _to_records(table) for name, table in tables.items()}}
+
+    if cache_path:
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        os.replace(tmp_path, cache_path)
+    return results, False
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Aggregate scraped reviews or interviews.')
+    parser.add_argument('inputs', nargs='+', help='Scraper outputs: .csv, .jsonl, or .parquet files or directories.')
+    parser.add_argument('--kind', choices=sorted(SCHEMAS), default=None,
+                        help='Record kind; guessed from the columns by default.')
+    parser.add_argument('--min-count', type=int, default=1,
+                        help='Leave out locations and positions with fewer records.')
+    parser.add_argument('--top', type=int, default=20, help='Rows printed per table.')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory where results are memoized by input hash.')
+    parser.add_argument('--no-cache', action='store_true', default=False, help='Always recompute.')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows loaded at a time.')
+    parser.add_argument('-o', '--output', default=None, help='Write all results as JSON to this path.')
+    args = parser.parse_args()
+
+    all_results = {}
+    for path in args.inputs:
+        start = time.perf_counter()
+        results, cached = analyze(path, kind=args.kind, min_count=args.min_count,
+                                  cache_dir=None if args.no_cache else args.cache_dir, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        all_results[path] = results
+        print(f"{path}: {results['kind']} {'from cache' if cached else 'computed'} in {elapsed:.2f} s",
+              file=sys.stderr)
+        with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.precision', 3):
+            for name, rows in results['tables'].items():
+                print(f"\n== {path}: {name} ==")
+                print(pd.DataFrame(rows).head(args.top).to_string(index=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"Saved to {os.path.abspath(args.output)}", file=sys.stderr)
@@ -0,0 +1,170 @@
+import datetime
+import logging
+import os
+import sys
+from argparse import ArgumentParser
+from functools import partial
+from urllib.parse import urlparse
+
+import interviews
+import reviews
+from cli import (add_common_arguments, check_common_arguments, close_run, open_html_cache, open_http_fetcher,
+                 open_playwright_backend, open_proxy_pool, open_record_store)
+from crawler import PageCrawl, run_crawls
+from driver_pool import DriverPool
+from pacing import pacer
+from record_store import company_from_url
+from sinks import Checkpoint, MultiSink, open_sink, CHECKPOINT_SUFFIX
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+SCRAPERS = {
+    'reviews': reviews,
+    'interviews': interviews,
+}
+
+
+def kind_from_url(url):
+    path = urlparse(url).path
+    if path.startswith('/Reviews/'):
+        return 'reviews'
+    if path.startswith('/Interview/'):
+        return 'interviews'
+    raise ValueError(f"Cannot tell whether {url} lists reviews or interviews")
+
+
+def load_jobs(path):
+    """Reads `(kind, url)` pairs from a file of review and interview URLs, one per line."""
+    jobs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            url = line.split('#', 1)[0].strip()
+            if url:
+                jobs.append((kind_from_url(url), url))
+    return list(dict.fromkeys(jobs))
+
+
+def parse_args(argv=None):
+    parser = ArgumentParser(description='Scrape the reviews and interviews of many companies on one worker pool.')
+    parser.add_argument('urls_file',
+                        help='File of Glassdoor review and interview page URLs, one per line.')
+    parser.add_argument('-o', '--output-dir',
+                        help='Directory receiving one output file per URL, named after the company page.',
+                        default='batch_output')
+    parser.add_argument('--format',
+                        help='Output file format.',
+                        choices=FORMATS,
+                        default='csv')
+    parser.add_argument('--workers',
+                        help='Number of workers loading pages in parallel, shared by all companies.',
+                        type=int,
+                        default=4)
+    parser.add_argument('--max-active',
+                        help='Number of companies crawled at the same time (default: twice the workers).',
+                        type=int,
+                        default=None)
+    parser.add_argument('--hide-window',
+                        help='Hide or run headless the browser windows.',
+                        action='store_true',
+                        default=False)
+    add_common_arguments(parser, proxy=False)
+    return check_common_arguments(parser, parser.parse_args(argv))
+
+
+def make_crawls(jobs, args, driver_pools, http_fetcher=None, playwright_backend=None, html_cache=None,
+                on_error=None):
+    """
+    Yields one PageCrawl per job, opening its output only when the scheduler
+    pulls it in. A job whose output cannot be opened is reported to
+    `on_error(name, error)` and left out, instead of ending the generator.
+    """
+    for kind, url in jobs:
+        company = company_from_url(url)
+        path = os.path.join(args.output_dir, f'{company}.{args.format}')
+        record_store = None
+        try:
+            checkpoint = Checkpoint(path + CHECKPOINT_SUFFIX, url, resume=args.resume)
+            record_store = open_record_store(args, kind, company)
+            fetch_page = SCRAPERS[kind].make_fetch_page(url, driver_pools[kind], http_fetcher=http_fetcher,
+                                                        playwright_backend=playwright_backend,
+                                                        html_cache=html_cache)
+            sink = open_sink(path, append=args.resume, kind=kind, offset=checkpoint.offset)
+        except Exception as e:
+            if record_store is not None:
+                record_store.close()
+            if on_error is None:
+                raise
+            on_error(company, e)
+            continue
+        logger.info(f"{company}: starting, writing to {path}")
+        yield PageCrawl(fetch_page, sink=MultiSink(sink, record_store),
+                        checkpoint=checkpoint,
+                        is_last_page=record_store.is_known_page if args.incremental else None,
+                        count_pages=True, name=company)
+
+
+def run_batch(jobs, args, driver_pools, http_fetcher=None, playwright_backend=None, html_cache=None):
+    """Crawls every job on one worker pool; returns the names of the crawls that failed."""
+    finished = []
+    failed = []
+
+    def log_progress():
+        logger.info(f"Batch progress: {len(finished)}/{len(jobs)} listings finished")
+
+    def on_error(name, error):
+        finished.append(name)
+        failed.append(name)
+        logger.error(f"{name}: could not start: {error!r}")
+        log_progress()
+
+    def on_finished(crawl):
+        crawl.sink.close()
+        finished.append(crawl.name)
+        if crawl.error is not None:
+            failed.append(crawl.name)
+            logger.error(f"{crawl.name}: failed after {crawl.pages_done} pages: {crawl.error!r}")
+        else:
+            logger.info(f"{crawl.name}: done, {crawl.pages_done} pages")
+        log_progress()
+
+    run_crawls(make_crawls(jobs, args, driver_pools, http_fetcher=http_fetcher,
+                           playwright_backend=playwright_backend, html_cache=html_cache, on_error=on_error),
+               workers=args.workers, max_active=args.max_active or 2 * args.workers,
+               on_finished=on_finished)
+    return failed
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    pacer.use_profile(args.pace)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    start_timestamp = datetime.datetime.now()
+
+    jobs = load_jobs(args.urls_file)
+    logger.info(f"{len(jobs)} listings to crawl with {args.workers} workers")
+    os.makedirs(args.output_dir, exist_ok=True)
+    html_cache = open_html_cache(args)
+    proxy_pool = open_proxy_pool(args)
+    http_fetcher = open_http_fetcher(args, proxy_pool)
+    playwright_backend = open_playwright_backend(args, args.hide_window, proxy_pool)
+    driver_options = {'page_load_strategy': args.page_load_strategy, 'blocked_urls': args.blocked_urls}
+    # Both pools launch browsers lazily, so a batch of one kind never starts the other's
+    driver_pools = {
+        'reviews': DriverPool(partial(reviews.get_driver, hide_window=args.hide_window, **driver_options),
+                              max_pages=args.pages_per_driver, proxy_pool=proxy_pool),
+        'interviews': DriverPool(partial(interviews.get_driver, headless=args.hide_window, **driver_options),
+                                 max_pages=args.pages_per_driver, proxy_pool=proxy_pool),
+    }
+    try:
+        failed = run_batch(jobs, args, driver_pools, http_fetcher=http_fetcher,
+                           playwright_backend=playwright_backend, html_cache=html_cache)
+    finally:
+        for driver_pool in driver_pools.values():
+            driver_pool.close()
+        close_run(args, proxy_pool, http_fetcher, playwright_backend)
+    elapsed = (datetime.datetime.now() - start_timestamp).total_seconds()
+    logger.info(f"Finished {len(jobs) - len(failed)}/{len(jobs)} listings in {elapsed:.0f} seconds")
+    if failed:
+        logger.error(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+from argparse import ArgumentParser
+
+from crawler import crawl_pages
+from fixture_server import FixtureServer
+
+BACKENDS = ('http', 'browser', 'playwright')
+KINDS = ('reviews', 'interviews')
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class RssSampler:
+    """
+    Samples the resident memory of this process and its children (the
+    browsers) in the background and keeps the peak, in bytes. Needs psutil;
+    without it the peak stays None, since the process-wide `ru_maxrss` would
+    carry over from one run to the next.
+    """
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+
+    def _run(self):
+        try:
+            import psutil
+        except ImportError:
+            return
+        process = psutil.Process()
+        while not self._stop.is_set():
+            try:
+                rss = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    try:
+                        rss += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+            except psutil.Error:
+                rss = 0
+            self.peak = max(self.peak or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def open_backend(backend, workers):
+    """Returns `(get_page(kind, url), close)` for one backend."""
+    if backend == 'http':
+        from http_backend import HttpFetcher, get_interviews_over_http, get_reviews_over_http
+        fetcher = HttpFetcher(pool_size=workers)
+        getters = {'reviews': get_reviews_over_http, 'interviews': get_interviews_over_http}
+        return (lambda kind, url: getters[kind](fetcher, url)), fetcher.close
+    if backend == 'playwright':
+        from playwright_backend import PlaywrightBackend
+        playwright_backend = PlaywrightBackend(contexts=workers, max_in_flight=workers)
+        getters = {'reviews': playwright_backend.get_reviews, 'interviews': playwright_backend.get_interviews}
+        return (lambda kind, url: getters[kind](url)), playwright_backend.close
+    if backend == 'browser':
+        from functools import partial
+        from driver_pool import DriverPool
+        import interviews
+        import reviews
+
+        reviews_pool = DriverPool(partial(reviews.get_driver, hide_window=True))
+        interviews_pool = DriverPool(partial(interviews.get_driver, headless=True))
+
+        def get_page(kind, url):
+            if kind == 'reviews':
+                return reviews.get_reviews_with_retry(reviews_pool, url)
+            return interviews.get_interviews_with_retry(interviews_pool, url)
+
+        def close():
+            reviews_pool.close()
+            interviews_pool.close()
+
+        return get_page, close
+    raise ValueError(f'Unknown backend {backend}')
+
+
+def run_benchmark(server, kind, backend, workers):
+    url = server.reviews_url if kind == 'reviews' else server.interviews_url
+    url_base = url[:-4]
+    latencies = []
+    lock = threading.Lock()
+
+    with RssSampler() as rss:
+        get_page, close = open_backend(backend, workers)
+        try:
+            def fetch_page(page):
+                start = time.perf_counter()
+                records = get_page(kind, url_base + f'_P{page}.htm')
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                return records
+
+            start = time.perf_counter()
+            records = crawl_pages(fetch_page, workers=workers)
+            elapsed = time.perf_counter() - start
+        finally:
+            close()
+
+    pages = len(latencies)
+    return {
+        'kind': kind,
+        'backend': backend,
+        'workers': workers,
+        'pages': pages,
+        'records': len(records),
+        'seconds': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed else None,
+        'records_per_sec': len(records) / elapsed if elapsed else None,
+        'latency_p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+        'latency_p90_ms': percentile(latencies, 90) * 1000 if latencies else None,
+        'latency_p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+        'peak_rss_mb': rss.peak / (1024 * 1024) if rss.peak else None,
+    }
+
+
+def format_row(result):
+    def number(value, digits=1):
+        return '-' if value is None else f'{value:.{digits}f}'
+    return (f"{result['kind']:<10} {result['backend']:<10} {result['workers']:>7} {result['pages']:>6} "
+            f"{number(result['pages_per_sec']):>9} {number(result['records_per_sec']):>10} "
+            f"{number(result['latency_p50_ms']):>8} {number(result['latency_p90_ms']):>8} "
+            f"{number(result['latency_p99_ms']):>8} {number(result['peak_rss_mb']):>9}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Measure scraper throughput against a local fixture server.')
+    parser.add_argument('--backends', default='http',
+                        help=f'Comma-separated backends to run, out of {",".join(BACKENDS)}.')
+    parser.add_argument('--workers', default='1,4',
+                        help='Comma-separated worker counts to run each backend with.')
+    parser.add_argument('--kinds', default=','.join(KINDS),
+                        help='Comma-separated page kinds: reviews, interviews.')
+    parser.add_argument('--pages', type=int, default=50, help='Number of non-empty pages per kind.')
+    parser.add_argument('--per-page', type=int, default=10, help='Records per page.')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every fixture response.')
+    parser.add_argument('--fixtures-dir', default=None, help='Directory of recorded pages served by path.')
+    parser.add_argument('-o', '--output', default=None, help='Write the results as JSON to this path.')
+    args = parser.parse_args()
+
+    results = []
+    with FixtureServer(total_pages=args.pages, per_page=args.per_page, latency=args.latency_ms / 1000,
+                       fixtures_dir=args.fixtures_dir) as server:
+        print(f"{'kind':<10} {'backend':<10} {'workers':>7} {'pages':>6} {'pages/s':>9} {'records/s':>10} "
+              f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'peak MB':>9}")
+        for kind in args.kinds.split(','):
+            for backend in args.backends.split(','):
+                for workers in (int(w) for w in args.workers.split(',')):
+                    result = run_benchmark(server, kind, backend, workers)
+                    results.append(result)
+                    print(format_row(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved to {os.path.abspath(args.output)}")
@@ -0,0 +1,287 @@
+import logging
+import math
+import threading
+import time
+
+from metrics import metrics, profiled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SKIPPED_IN_ROW = 5
+
+# Returned by PageCrawl.claim_page while later pages wait for the page count
+PENDING = object()
+
+
+class PageCrawl:
+    """
+    Page scheduling state for one paginated listing, shared by the workers
+    crawling it. See crawl_pages for the meaning of the arguments.
+    """
+
+    def __init__(self, fetch_page, start_page=1, sink=None, checkpoint=None, is_last_page=None,
+                 profile_page=None, profile_path=None, count_pages=False,
+                 max_skipped_in_row=DEFAULT_MAX_SKIPPED_IN_ROW, name=None):
+        self.fetch_page = fetch_page
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.is_last_page = is_last_page
+        self.profile_page = profile_page
+        self.profile_path = profile_path
+        self.count_pages = count_pages
+        self.max_skipped_in_row = max_skipped_in_row
+        self.name = name or 'crawl'
+        self.lock = threading.Lock()
+        # A copy: mark_done adds to completed_pages, which would count finished pages twice
+        self.skip_pages = set(checkpoint.completed_pages) if checkpoint is not None else set()
+        self.next_page = start_page
+        self.next_emit = start_page
+        self.stop_at = math.inf
+        self.last_page = None
+        self.first_page = None
+        self.first_page_done = not count_pages
+        self.skipped_in_row = 0
+        self.in_flight = 0
+        self.pages_done = 0
+        self.results = {}
+        self.records = []
+        self.error = None
+        self.started_at = time.perf_counter()
+        self.finished = False
+
+    def _next_unclaimed(self):
+        page = self.next_page
+        while page in self.skip_pages:
+            page += 1
+        return page
+
+    def claim_page(self):
+        """Returns the next page to fetch, PENDING, or None once nothing is left."""
+        with self.lock:
+            page = self._next_unclaimed()
+            if page >= self.stop_at:
+                return None
+            if not self.first_page_done:
+                if self.first_page is not None:
+                    return PENDING
+                self.first_page = page
+            self.next_page = page + 1
+            self.in_flight += 1
+            return page
+
+    def is_done(self):
+        """True once no page is left to claim and none is being fetched."""
+        with self.lock:
+            return self.in_flight == 0 and self._next_unclaimed() >= self.stop_at
+
+    def set_last_page(self, last_page):
+        with self.lock:
+            self._set_last_page(last_page)
+
+    def _set_last_page(self, last_page):
+        self.last_page = last_page
+        self.stop_at = min(self.stop_at, last_page + 1)
+        logger.info(f"{self.name}: {last_page} pages in total")
+
+    def _emit_ready_pages(self):
+        while self.next_emit < self.stop_at and (
+                self.next_emit in self.results or self.next_emit in self.skip_pages):
+            page = self.next_emit
+            records = self.results.pop(page, None)
+            if records is not None:
+                if self.sink is not None:
+                    self.sink.write_page(page, records)
+                else:
+                    self.records.extend(records)
+                if self.checkpoint is not None:
+                    position = getattr(self.sink, 'position', None)
+                    self.checkpoint.mark_done(page, offset=position() if position is not None else None)
+            self.next_emit += 1
+
+    def _log_progress(self):
+        if self.last_page is None:
+            logger.info(f"{self.name}: {self.pages_done} pages done")
+            return
+        remaining = max(0, self.last_page - len(self.skip_pages) - self.pages_done)
+        elapsed = time.perf_counter() - self.started_at
+        eta = elapsed / self.pages_done * remaining if self.pages_done else math.inf
+        logger.info(f"{self.name}: {self.pages_done}/{self.pages_done + remaining} pages done, ETA {eta:.0f}s")
+
+    def fetch(self, page):
+        """Fetches a claimed page and records its outcome; never raises."""
+        page_info = {} if self.count_pages and page == self.first_page else None
+        # Emitting pages can fail after the page was released, it must not be released twice
+        released = False
+        try:
+            with metrics.span('page'):
+                if page == self.profile_page:
+                    with profiled(self.profile_path or f'page_{page}.pstats'):
+                        records = self._call_fetch_page(page, page_info)
+                else:
+                    records = self._call_fetch_page(page, page_info)
+            if records is None:
+                metrics.incr('pages_skipped')
+            else:
+                metrics.incr('pages')
+                metrics.incr('records', len(records))
+                metrics.observe('records_per_page', len(records))
+            is_last = records is not None and (
+                len(records) == 0 or (self.is_last_page is not None and self.is_last_page(records)))
+            with self.lock:
+                self.in_flight -= 1
+                released = True
+                self.pages_done += 1
+                if page == self.first_page:
+                    self.first_page_done = True
+                    total_count = (page_info or {}).get('total_count')
+                    if total_count is not None and records:
+                        self._set_last_page(max(page, math.ceil(total_count / len(records))))
+                if is_last:
+                    self.stop_at = min(self.stop_at, page)
+                else:
+                    self.results[page] = records
+                if records is None:
+                    self.skipped_in_row += 1
+                    # Without a known page count, a run of failures is the only end marker left
+                    if self.last_page is None and self.skipped_in_row >= self.max_skipped_in_row:
+                        logger.error(f"{self.name}: {self.skipped_in_row} pages in a row failed, stopping")
+                        self.stop_at = min(self.stop_at, page + 1)
+                else:
+                    self.skipped_in_row = 0
+                self._emit_ready_pages()
+                self._log_progress()
+        except BaseException as e:
+            with self.lock:
+                if not released:
+                    self.in_flight -= 1
+                self.first_page_done = True
+                self.stop_at = min(self.stop_at, page)
+                if self.error is None:
+                    self.error = e
+
+    def _call_fetch_page(self, page, page_info):
+        if self.count_pages:
+            return self.fetch_page(page, page_info=page_info)
+        return self.fetch_page(page)
+
+
+def run_crawls(crawls, workers=1, max_active=None, on_finished=None):
+    """
+    Fetches the pages of several PageCrawls on one pool of `workers` threads.
+
+    Workers take pages round-robin from the active crawls, so every listing
+    advances at the same pace and a crawl waiting on its page count does not
+    hold up the others. `crawls` may be a lazy iterable: at most `max_active`
+    crawls are in rotation at once, and the next one is pulled in as soon as
+    one finishes, so workers stay busy until the very last page.
+    `on_finished(crawl)` is called once per crawl when its last page is done;
+    errors are left in `crawl.error` instead of being raised.
+    """
+    condition = threading.Condition()
+    pending = iter(crawls)
+    active = []
+    state = {'next': 0, 'exhausted': False}
+
+    def fill():
+        while not state['exhausted'] and (max_active is None or len(active) < max_active):
+            crawl = next(pending, None)
+            if crawl is None:
+                state['exhausted'] = True
+            else:
+                active.append(crawl)
+
+    def retire(crawl):
+        active.remove(crawl)
+        crawl.finished = True
+        if on_finished is not None:
+            on_finished(crawl)
+        fill()
+
+    def claim():
+        # Called with the condition held
+        while True:
+            fill()
+            if not active:
+                return None, None
+            waiting = False
+            for offset in range(len(active)):
+                index = (state['next'] + offset) % len(active)
+                crawl = active[index]
+                page = crawl.claim_page()
+                if page is PENDING:
+                    waiting = True
+                elif page is not None:
+                    state['next'] = index + 1
+                    return crawl, page
+                elif crawl.is_done():
+                    retire(crawl)
+                    break
+                else:
+                    waiting = True
+            else:
+                if waiting:
+                    condition.wait()
+
+    def worker():
+        while True:
+            with condition:
+                crawl, page = claim()
+            if crawl is None:
+                return
+            crawl.fetch(page)
+            with condition:
+                if not crawl.finished and crawl in active and crawl.is_done():
+                    retire(crawl)
+                condition.notify_all()
+
+    if workers <= 1:
+        worker()
+    else:
+        threads = [threading.Thread(target=worker, name=f"crawler-{i}", daemon=True)
+                   for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def run_crawl(crawl, workers=1):
+    run_crawls([crawl], workers=workers)
+    if crawl.error is not None:
+        raise crawl.error
+    return crawl.records
+
+
+def crawl_pages(fetch_page, workers=1, start_page=1, sink=None, checkpoint=None, is_last_page=None,
+                profile_page=None, profile_path=None, count_pages=False,
+                max_skipped_in_row=DEFAULT_MAX_SKIPPED_IN_ROW, name=None):
+    """
+    Fetches pages `start_page, start_page + 1, ...` on `workers` threads until
+    the first empty page.
+
+    `fetch_page(page)` returns the page's records, an empty list once past the
+    last page, or None when the page could not be loaded and was skipped.
+    Pages are handed out one at a time, so each worker shards the page range
+    dynamically; pages beyond the first empty one are discarded.
+
+    With `count_pages`, `fetch_page` is called as `fetch_page(page, page_info)`.
+    For the first page fetched, `page_info` is a dict in which the total record
+    count can be stored under 'total_count'. That page runs alone, and the crawl
+    is then bounded to the pages that count implies. Otherwise the crawl stops
+    after `max_skipped_in_row` pages in a row fail, so persistent failures
+    cannot run far past the real end.
+
+    Finished pages are emitted in page order as soon as all earlier pages are
+    done: written to `sink` and marked in `checkpoint` when given, otherwise
+    collected and returned. Pages already in the checkpoint are not fetched.
+
+    `is_last_page(records)` can end the crawl early on a non-empty page; that
+    page is treated like the first empty one.
+
+    Page and record counts go to the shared run metrics; `profile_page` is
+    fetched under cProfile, with the stats dumped to `profile_path`.
+    """
+    crawl = PageCrawl(fetch_page, start_page=start_page, sink=sink, checkpoint=checkpoint,
+                      is_last_page=is_last_page, profile_page=profile_page, profile_path=profile_path,
+                      count_pages=count_pages, max_skipped_in_row=max_skipped_in_row, name=name)
+    return run_crawl(crawl, workers=workers)
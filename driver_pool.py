@@ -0,0 +1,111 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_DRIVER = 50
+
+
+class DriverSession:
+    def __init__(self, driver, wait, proxy=None):
+        self.driver = driver
+        self.wait = wait
+        self.proxy = proxy
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Keeps warm browser sessions alive across pages.
+
+    `factory` is called with no arguments and must return a `(driver, wait)`
+    tuple like `get_driver` in reviews.py and interviews.py do. A session is
+    recycled after `max_pages` pages, or as soon as the block using it raises.
+
+    With a `proxy_pool`, each new session is bound to the best available
+    proxy, passed to `factory` as `proxy=`. Every page then waits for a token
+    of that proxy and reports its outcome; a session whose proxy was taken
+    out of rotation is replaced by one on another proxy.
+    """
+
+    def __init__(self, factory, max_pages=DEFAULT_PAGES_PER_DRIVER, proxy_pool=None):
+        self.factory = factory
+        self.max_pages = max_pages
+        self.proxy_pool = proxy_pool
+        self._idle = queue.LifoQueue()
+        self._closed = False
+        # Concurrent undetected_chromedriver launches race on patching the binary
+        self._create_lock = threading.Lock()
+
+    def _create(self):
+        if self.proxy_pool is None:
+            with self._create_lock, metrics.span('driver_launch'):
+                driver, wait = self.factory()
+            return DriverSession(driver, wait)
+        # Takes the token for the session's first page
+        proxy = self.proxy_pool.acquire()
+        try:
+            with self._create_lock, metrics.span('driver_launch'):
+                driver, wait = self.factory(proxy=proxy.url)
+        except BaseException:
+            self.proxy_pool.release(proxy)
+            raise
+        return DriverSession(driver, wait, proxy)
+
+    def _discard(self, session):
+        try:
+            session.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting driver: {e}")
+        if session.proxy is not None:
+            self.proxy_pool.release(session.proxy)
+
+    def _get(self):
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if session.proxy is None or self.proxy_pool.take_token(session.proxy):
+                return session
+            self._discard(session)
+
+    @contextmanager
+    def session(self):
+        session = self._get()
+        start = time.perf_counter()
+        try:
+            yield session
+        except BaseException:
+            metrics.incr('driver_recycled_on_error')
+            if session.proxy is not None:
+                self.proxy_pool.report(session.proxy, ok=False)
+            self._discard(session)
+            raise
+        if session.proxy is not None:
+            self.proxy_pool.report(session.proxy, ok=True, latency=time.perf_counter() - start)
+        session.pages += 1
+        if self._closed or (self.max_pages and session.pages >= self.max_pages):
+            self._discard(session)
+        else:
+            self._idle.put(session)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
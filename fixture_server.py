@@ -0,0 +1,197 @@
+import html
+import os
+import random
+import re
+import threading
+import time
+from argparse import ArgumentParser
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from review_parser import predefined_svg_elements, SUBRATING_KEYS
+
+REVIEWS_PATH = '/Reviews/Benchmark-Reviews-E1.htm'
+INTERVIEWS_PATH = '/Interview/Benchmark-Interview-Questions-E1.htm'
+PAGE_PATTERN = re.compile(r'_P(\d+)\.htm$')
+
+LOCATION_ICON = '<svg class="icon_Icon__ptI3R" width="16" height="16"><path d="M8 1a5 5 0 0 0-5 5c0 4 5 9 5 9s5-5 5-9a5 5 0 0 0-5-5"></path></svg>'
+STAR = '<span class="RatingStar"></span>'
+STAR_OUTLINE = '<span class="RatingStarOutline"></span>'
+POSITIONS = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Sales Associate', 'Support Specialist']
+LOCATIONS = ['New York, NY', 'London, England', 'Berlin', 'Remote', 'Austin, TX']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WORDS = ('great team flexible hours poor management good pay long meetings learning '
+         'growth culture benefits stress deadlines friendly process').split()
+
+
+def _sentence(rng, words=12):
+    return html.escape(' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.')
+
+
+def _date(rng):
+    return f'{rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2015, 2025)}'
+
+
+def _helpful(rng):
+    count = rng.randint(0, 40)
+    return f'<div data-test="review-helpful-count">{count} people found this helpful</div>' if count else ''
+
+
+def review_item(rng):
+    subratings = ''.join(
+        f'<div class="review-rating_subRating__0Q_Z0"><div>{key}</div>'
+        + STAR * stars + STAR_OUTLINE * (5 - stars) + '</div>'
+        for key, stars in ((key, rng.randint(1, 5)) for key in SUBRATING_KEYS)
+    )
+    icons = ''.join(f'<div>{rng.choice(list(predefined_svg_elements.values()))}</div>' for _ in range(3))
+    return (
+        '<li><div class="review-details_reviewDetails">'
+        f'<div class="review-rating_ratingContainer__sQ_4_"><span>{rng.randint(1, 5)}.0</span>'
+        f'<aside>{subratings}</aside></div>'
+        f'<span>{_date(rng)}</span><span>-</span><span>{rng.choice(POSITIONS)}</span>'
+        f'<h3>{_sentence(rng, 4)}</h3>'
+        f'<div class="text-with-icon_TextWithIcon__5ZZqT">Current employee</div>'
+        f'<div class="text-with-icon_TextWithIcon__5ZZqT">{LOCATION_ICON}{rng.choice(LOCATIONS)}</div>'
+        f'<div class="review-details_experienceContainer__2W06X">{icons}</div>'
+        f'<p>Pros</p><p>{_sentence(rng)}</p><p>Cons</p><p>{_sentence(rng)}</p>'
+        f'{_helpful(rng)}'
+        '</div></li>'
+    )
+
+
+def interview_item(rng, index):
+    brandviews = f'MODULE:n=interview-reviews:eid=1:id={index}'
+    questions = ''.join(
+        '<div class="interview-details_interviewText__YH2ZO">'
+        f'<p>{_sentence(rng, 8)}?</p></div>'
+        for _ in range(rng.randint(1, 3))
+    )
+    # Glassdoor nests two divs with the same data-brandviews per interview
+    return (
+        f'<div data-brandviews="{brandviews}"><div data-brandviews="{brandviews}">'
+        f'<h3>{rng.choice(POSITIONS)} Interview</h3>'
+        f'<span>{_date(rng)}</span><span>Anonymous Interview Candidate</span>'
+        f'<span>{rng.choice(["Accepted offer", "Declined offer", "No offer"])}</span>'
+        f'<span>{rng.choice(["Positive experience", "Neutral experience", "Negative experience"])}</span>'
+        f'<span>{rng.choice(["Easy interview", "Average interview", "Difficult interview"])}</span>'
+        f'<div class="text-with-icon_TextWithIcon__5ZZqT">{LOCATION_ICON}{rng.choice(LOCATIONS)}</div>'
+        f'<p>Application</p><p>{_sentence(rng)}</p><p>Interview</p><p>{_sentence(rng, 30)}</p>'
+        f'<div data-test="question-container">{questions}</div>'
+        f'{_helpful(rng)}'
+        '</div></div>'
+    )
+
+
+@lru_cache(maxsize=4096)
+def render_page(kind, page, total_pages, per_page, seed=0):
+    rng = random.Random(f'{seed}-{kind}-{page}')
+    count = per_page if page <= total_pages else 0
+    first = (page - 1) * per_page + 1
+    footer = (f'<div data-test="pagination-footer-text">Showing <strong>{first} - {first + count - 1}</strong> '
+              f'of <strong>{total_pages * per_page:,}</strong> {kind}</div>')
+    if kind == 'reviews':
+        items = ''.join(review_item(rng) for _ in range(count))
+        body = f'<div id="ReviewsFeed"><ol>{items}</ol></div>{footer}'
+    else:
+        items = ''.join(interview_item(rng, first - 1 + i) for i in range(count))
+        body = f'<div data-test="InterviewList">{items}</div>{footer}'
+    return f'<!DOCTYPE html><html><head><title>{kind} page {page}</title></head><body>{body}</body></html>'
+
+
+class FixtureServer:
+    """
+    Local HTTP server serving synthetic review and interview pages in the DOM
+    shape the parsers expect, at `REVIEWS_PATH` / `INTERVIEWS_PATH` with
+    `_P{n}.htm` pagination. Pages past `total_pages` have an empty container.
+    Files under `fixtures_dir` are served as-is, for recorded pages.
+    """
+
+    def __init__(self, total_pages=50, per_page=10, latency=0.0, fixtures_dir=None, port=0):
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.latency = latency
+        self.fixtures_dir = fixtures_dir
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def reviews_url(self):
+        return self.base_url + REVIEWS_PATH
+
+    @property
+    def interviews_url(self):
+        return self.base_url + INTERVIEWS_PATH
+
+    def render(self, path):
+        if self.fixtures_dir:
+            fixtures_dir = os.path.abspath(self.fixtures_dir)
+            file_path = os.path.abspath(os.path.join(fixtures_dir, path.lstrip('/')))
+            # Recorded pages only, never a path escaping the directory
+            if os.path.commonpath([fixtures_dir, file_path]) == fixtures_dir and os.path.isfile(file_path):
+                with open(file_path, encoding='utf-8') as f:
+                    return f.read()
+        match = PAGE_PATTERN.search(path)
+        if not match:
+            return None
+        kind = 'interviews' if path.startswith('/Interview/') else 'reviews'
+        return render_page(kind, int(match.group(1)), self.total_pages, self.per_page)
+
+    def _handler(self):
+        fixture_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if fixture_server.latency:
+                    time.sleep(fixture_server.latency)
+                body = fixture_server.render(self.path.split('?')[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='fixture-server', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Serve synthetic Glassdoor-like pages locally.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=50, help='Number of non-empty pages per kind.')
+    parser.add_argument('--per-page', type=int, default=10, help='Records per page.')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Delay added to every response.')
+    parser.add_argument('--fixtures-dir', default=None, help='Directory of recorded pages served by path.')
+    args = parser.parse_args()
+
+    server = FixtureServer(total_pages=args.pages, per_page=args.per_page, latency=args.latency_ms / 1000,
+                           fixtures_dir=args.fixtures_dir, port=args.port)
+    print(f"Reviews: {server.reviews_url}")
+    print(f"Interviews: {server.interviews_url}")
+    server.server.serve_forever()
@@ -0,0 +1,149 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_MAX_MB = 1024
+
+
+class HtmlCache:
+    """
+    Compressed, content-addressed store of fetched page HTML.
+
+    Blobs live under `objects/` named by the SHA-256 of their content, so
+    identical pages are stored once; `index.db` (SQLite) maps each URL to its
+    blob and fetch time. Entries older than `ttl` seconds are treated as
+    missing unless `ignore_ttl` is passed, and the least recently fetched URLs
+    are evicted once the blobs exceed `max_bytes`.
+
+    The index is also kept in memory in fetch order, with the total size of
+    the blobs, so a put only writes its own row and evicts from the front.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_TTL_HOURS * 3600, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self.connection = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False)
+        # Commits without an fsync each; a crash can only lose the newest entries
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+        """)
+        self._import_json_index(os.path.join(directory, 'index.json'))
+        # Oldest first; a put moves its URL to the end
+        self.index = {}
+        self.references = Counter()
+        self.sizes = {}
+        for url, digest, fetched_at, size in self.connection.execute(
+                "SELECT url, digest, fetched_at, size FROM pages ORDER BY fetched_at"):
+            self._add(url, {'digest': digest, 'fetched_at': fetched_at, 'size': size})
+        self.total_bytes = sum(self.sizes.values())
+
+    def _import_json_index(self, path):
+        # Caches written before the index moved to SQLite
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO pages (url, digest, fetched_at, size) VALUES (?, ?, ?, ?)",
+                [(url, entry['digest'], entry['fetched_at'], entry['size']) for url, entry in index.items()],
+            )
+        os.remove(path)
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + '.html.gz')
+
+    def _add(self, url, entry):
+        self.index[url] = entry
+        self.references[entry['digest']] += 1
+        self.sizes[entry['digest']] = entry['size']
+
+    def _remove(self, url):
+        """Drops `url` from the in-memory index; returns the digest if no URL references it anymore."""
+        digest = self.index.pop(url)['digest']
+        self.references[digest] -= 1
+        if self.references[digest]:
+            return None
+        del self.references[digest]
+        self.total_bytes -= self.sizes.pop(digest)
+        return digest
+
+    def put(self, url, html):
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f'{path}.{threading.get_ident()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(gzip.compress(data))
+                os.replace(tmp_path, path)
+            entry = {'digest': digest, 'fetched_at': time.time(), 'size': os.path.getsize(path)}
+            # The blob stays, it is about to be referenced again
+            unreferenced = self._remove(url) if url in self.index else None
+            if digest not in self.sizes:
+                self.total_bytes += entry['size']
+            self._add(url, entry)
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO pages (url, digest, fetched_at, size) VALUES (?, ?, ?, ?)",
+                    (url, digest, entry['fetched_at'], entry['size']),
+                )
+                if unreferenced is not None and unreferenced != digest:
+                    self._remove_object(unreferenced)
+                if self.total_bytes > self.max_bytes:
+                    self._evict()
+
+    def get(self, url, ignore_ttl=False):
+        with self._lock:
+            entry = self.index.get(url)
+        if entry is None:
+            return None
+        if not ignore_ttl and self.ttl and time.time() - entry['fetched_at'] > self.ttl:
+            return None
+        try:
+            with open(self._object_path(entry['digest']), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except (OSError, EOFError) as e:
+            logger.warning(f"Could not read cached page for {url}: {e}")
+            return None
+
+    def _remove_object(self, digest):
+        try:
+            os.remove(self._object_path(digest))
+        except OSError:
+            pass
+
+    def _evict(self):
+        # Called with the lock held, inside the put's transaction
+        evicted = []
+        while self.total_bytes > self.max_bytes and self.index:
+            url = next(iter(self.index))
+            evicted.append((url,))
+            digest = self._remove(url)
+            if digest is not None:
+                self._remove_object(digest)
+        self.connection.executemany("DELETE FROM pages WHERE url = ?", evicted)
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,170 @@
+import logging
+import time
+
+from metrics import metrics
+from pacing import pacer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+CHALLENGE_STATUS_CODES = (403, 429, 503)
+# Connection errors, timeouts and 5xx are retried, other HTTP errors are not
+DEFAULT_RETRIES = 2
+RETRY_DELAY = 1
+CHALLENGE_MARKERS = (
+    "challenge-platform",
+    "cf-chl-",
+    "Just a moment...",
+    "px-captcha",
+    "captcha-delivery",
+)
+
+
+class ChallengeDetected(Exception):
+    pass
+
+
+def find_challenge_marker(html):
+    for marker in CHALLENGE_MARKERS:
+        if marker in html:
+            return marker
+    return None
+
+
+def is_transient(error):
+    response = getattr(error, 'response', None)
+    return response is None or response.status_code >= 500
+
+
+class HttpFetcher:
+    """
+    Downloads pages over a pooled keep-alive HTTP session instead of a browser.
+    Raises ChallengeDetected when the response is a bot check, so the caller
+    can fall back to Selenium for that page. Transient errors are retried
+    `retries` times; what is left surfaces as a requests.RequestException.
+
+    With a `proxy_pool`, every request goes through the best available proxy;
+    challenge pages count as a ban of that proxy. A request that fails on one
+    proxy is retried right away on the next one the pool hands out, up to one
+    extra attempt per proxy, for as long as the pool has one within `timeout`.
+    """
+
+    def __init__(self, pool_size=10, timeout=15, proxy=None, proxy_pool=None, retries=DEFAULT_RETRIES):
+        # Imported here so that importing the scrapers does not pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.timeout = timeout
+        self.retries = retries
+        self.proxy_pool = proxy_pool
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        if proxy:
+            self.session.proxies.update({"http": proxy, "https": proxy})
+
+    def get_html(self, url, container=None):
+        """
+        The page at `url`. With `container`, a page containing that text is
+        returned as is; only pages missing it are checked for challenge markers,
+        since protected pages embed some of those scripts too.
+        """
+        import requests
+        from proxy_pool import NoProxyAvailable
+        attempts = self.retries + 1
+        if self.proxy_pool is not None:
+            attempts += len(self.proxy_pool) - 1
+        error = None
+        for attempt in range(attempts):
+            try:
+                # Only the first attempt waits for a proxy as long as it takes
+                return self._get_html_once(url, container, proxy_timeout=None if error is None else self.timeout)
+            except NoProxyAvailable:
+                if error is None:
+                    raise
+                raise error from None
+            except requests.RequestException as e:
+                if attempt == attempts - 1 or not is_transient(e):
+                    raise
+                error = e
+                logger.warning(f"{e}, retrying {url}...")
+                metrics.incr('http_retries')
+                if self.proxy_pool is None:
+                    time.sleep(RETRY_DELAY * 2 ** attempt)
+
+    def _get_html_once(self, url, container=None, proxy_timeout=None):
+        import requests
+        if self.proxy_pool is None:
+            return self._get_html(url, container=container)
+        proxy = self.proxy_pool.acquire(timeout=proxy_timeout)
+        start = time.perf_counter()
+        try:
+            html = self._get_html(url, container=container, proxies={"http": proxy.url, "https": proxy.url})
+        except ChallengeDetected:
+            self.proxy_pool.release(proxy, ok=False, banned=True)
+            raise
+        except requests.RequestException:
+            self.proxy_pool.release(proxy, ok=False)
+            raise
+        except BaseException:
+            self.proxy_pool.release(proxy)
+            raise
+        self.proxy_pool.release(proxy, ok=True, latency=time.perf_counter() - start)
+        return html
+
+    def _get_html(self, url, container=None, proxies=None):
+        pacer.before_page(url)
+        with metrics.span('http_get'):
+            response = self.session.get(url, timeout=self.timeout, proxies=proxies)
+        metrics.incr('bytes_received', len(response.content))
+        if response.status_code == 429:
+            pacer.throttled(url, 'HTTP 429')
+        if response.status_code in CHALLENGE_STATUS_CODES:
+            raise ChallengeDetected(f"{url} returned HTTP {response.status_code}")
+        response.raise_for_status()
+        html = response.text
+        if container is not None and container in html:
+            return html
+        marker = find_challenge_marker(html)
+        if marker:
+            raise ChallengeDetected(f"{url} returned a challenge page ({marker})")
+        if container is not None:
+            # Without the server-rendered container there is nothing to parse, let the browser handle it
+            raise ChallengeDetected(f"{url} has no server-rendered {container}")
+        return html
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_reviews_over_http(fetcher, url, html_cache=None, page_info=None):
+    import review_parser
+    html = fetcher.get_html(url, container='id="ReviewsFeed"')
+    if html_cache is not None:
+        html_cache.put(url, html)
+    with metrics.span('parse'):
+        if page_info is not None:
+            page_info['total_count'] = review_parser.parse_total_count(review_parser.page_text(html))
+        return review_parser.parse_reviews_html(html)
+
+
+def get_interviews_over_http(fetcher, url, html_cache=None, page_info=None):
+    import interview_parser
+    html = fetcher.get_html(url, container='data-test="InterviewList"')
+    if html_cache is not None:
+        html_cache.put(url, html)
+    with metrics.span('parse'):
+        if page_info is not None:
+            page_info['total_count'] = interview_parser.parse_total_count(interview_parser.page_text(html))
+        return interview_parser.parse_interviews_html(html)
@@ -1,4 +1,11 @@
+import json
+import logging
 import os
+import re
+import shutil
+import subprocess
+import time
+from functools import lru_cache
 
 import requests
 from requests import Response
@@ -9,6 +16,24 @@ from webdriver_manager.core.http import HttpClient
 from webdriver_manager.core.logger import log
 from selenium.webdriver.chrome.service import Service
 
+logger = logging.getLogger(__name__)
+
+# Resolved chromedriver path and versions, reused across runs and offline
+CACHE_PATH = os.environ.get(
+    'CHROMEDRIVER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'glassdoor-scraper', 'chromedriver.json'),
+)
+CHROME_BINARIES = (
+    'google-chrome',
+    'google-chrome-stable',
+    'chromium',
+    'chromium-browser',
+    'chrome',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+CHROME_REGISTRY_KEY = r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon'
+VERSION_PATTERN = re.compile(r'\d+\.\d+\.\d+\.\d+')
+
 class CustomHttpClient(HttpClient):
 
     def get(self, url, params=None, **kwargs) -> Response:
@@ -26,10 +51,99 @@ def test_can_get_chrome_driver_with_custom_http_client():
     assert os.path.exists(path)
     return path
 
+def _version_from(command):
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+def _major(version):
+    return version.split('.')[0] if version else None
+
+@lru_cache(maxsize=None)
+def get_chrome_version():
+    """Version of the installed Chrome, looked up once per process, or None if it cannot be found."""
+    if os.name == 'nt':
+        return _version_from(['reg', 'query', CHROME_REGISTRY_KEY, '/v', 'version'])
+    for binary in CHROME_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        version = _version_from([path, '--version']) if path else None
+        if version:
+            return version
+    return None
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cache(path, browser_version):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    entry = {
+        'path': path,
+        'driver_version': _version_from([path, '--version']),
+        'browser_version': browser_version,
+        'resolved_at': time.time(),
+    }
+    tmp_path = CACHE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, indent=2)
+    os.replace(tmp_path, CACHE_PATH)
+
+@lru_cache(maxsize=None)
+def cached_chromedriver_path():
+    """
+    The cached chromedriver, if it still exists and matches the major version
+    of the installed Chrome (or Chrome's version cannot be read); else None.
+    """
+    cache = load_cache()
+    if not cache or not os.path.exists(cache.get('path', '')):
+        return None
+    browser_version = get_chrome_version()
+    if browser_version and _major(browser_version) != _major(cache.get('browser_version')):
+        logger.info(f"Chrome is now {browser_version}, the cached chromedriver was for "
+                    f"{cache.get('browser_version')}")
+        return None
+    return cache['path']
+
+def invalidate_cache():
+    """Forgets the cached chromedriver, e.g. after Chrome refused to start a session with it."""
+    try:
+        os.remove(CACHE_PATH)
+    except FileNotFoundError:
+        pass
+    cached_chromedriver_path.cache_clear()
+
+def get_chromedriver_path():
+    path = cached_chromedriver_path()
+    if path:
+        return path
+    try:
+        path = test_can_get_chrome_driver_with_custom_http_client()
+    except Exception as e:
+        # Offline: a driver for another Chrome version may still work
+        cache = load_cache()
+        if cache and os.path.exists(cache.get('path', '')):
+            logger.warning(f"Could not resolve chromedriver ({e}), reusing {cache['path']}")
+            return cache['path']
+        raise
+    save_cache(path, get_chrome_version())
+    cached_chromedriver_path.cache_clear()
+    return path
+
+def cached_service():
+    """Service for the cached chromedriver, or None; never touches the network."""
+    path = cached_chromedriver_path()
+    return Service(path) if path else None
+
 def get_service():
-    path = test_can_get_chrome_driver_with_custom_http_client()
+    path = get_chromedriver_path()
     service = Service(path)
     return service
 
 if __name__ == "__main__":
-    test_can_get_chrome_driver_with_custom_http_client()
\ No newline at end of file
+    print(get_chromedriver_path())
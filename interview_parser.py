@@ -0,0 +1,97 @@
+import json
+import re
+import sys
+import time
+from argparse import ArgumentParser
+
+from lxml import etree, html as lxml_html
+
+# Compiled once; evaluated against an offline snapshot of the InterviewList container
+INTERVIEW_LIST_XPATH = etree.XPath('//div[@data-test="InterviewList"]')
+INTERVIEW_DIVS_XPATH = etree.XPath('.//div[starts-with(@data-brandviews, "MODULE:n=interview-reviews")]')
+TEXT_WITH_ICON_XPATH = etree.XPath('.//div[contains(@class, "text-with-icon")]')
+LOCATION_ICON_XPATH = etree.XPath('.//svg[@class="icon_Icon__ptI3R"]')
+H3_XPATH = etree.XPath('.//h3')
+SPAN_XPATH = etree.XPath('.//span')
+P_XPATH = etree.XPath('.//p')
+QUESTIONS_XPATH = etree.XPath(
+    './/div[@data-test="question-container"]'
+    '//div[contains(concat(" ", normalize-space(@class), " "), " interview-details_interviewText__YH2ZO ")]/p'
+)
+HELPFUL_COUNT_XPATH = etree.XPath('.//div[@data-test="review-helpful-count"]')
+
+
+# e.g. "Showing 1 - 10 of 1,234 interviews" in the list header/footer
+TOTAL_COUNT_PATTERN = re.compile(r'\bof\s+([\d,]+)\s+interview(?:s| reviews)\b', re.IGNORECASE)
+
+
+def _text(element):
+    return element.text_content().strip()
+
+
+def _nth_text(elements, index):
+    return _text(elements[index]) if len(elements) > index else None
+
+
+def get_location(div):
+    for optional_div in TEXT_WITH_ICON_XPATH(div):
+        if LOCATION_ICON_XPATH(optional_div):
+            return _text(optional_div)
+    return None
+
+
+def parse_interview_div(div):
+    h3_elements = H3_XPATH(div)
+    span_elements = SPAN_XPATH(div)
+    p_elements = P_XPATH(div)
+    helpful_divs = HELPFUL_COUNT_XPATH(div)
+    return {
+        "interview_position": _nth_text(h3_elements, 0),
+        "location": get_location(div),
+        "published_date": _nth_text(span_elements, 0),
+        "candidate": _nth_text(span_elements, 1),
+        "is_offer_received": _nth_text(span_elements, 2),
+        "interview_experience": _nth_text(span_elements, 3),
+        "interview_difficulty": _nth_text(span_elements, 4),
+        "application_process": _nth_text(p_elements, 1),
+        "interview_review": _nth_text(p_elements, 3),
+        "interview_questions": [q.text_content() for q in QUESTIONS_XPATH(div)],
+        "helpful_count": _text(helpful_divs[0]) if helpful_divs else 0,
+    }
+
+
+def parse_total_count(text):
+    match = TOTAL_COUNT_PATTERN.search(text or '')
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def page_text(html):
+    return lxml_html.fromstring(html).text_content()
+
+
+def parse_interviews_html(html):
+    """
+    Extracts interview records from the outerHTML of the InterviewList
+    container, or from a full saved page that contains it.
+    """
+    root = lxml_html.fromstring(html)
+    containers = INTERVIEW_LIST_XPATH(root)
+    container = containers[0] if containers else root
+    interview_divs = INTERVIEW_DIVS_XPATH(container)[::2]  # the divs are duplicated, so we need to skip every other one
+    return [parse_interview_div(div) for div in interview_divs]
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Parse interviews from saved Glassdoor HTML files.')
+    parser.add_argument('files', nargs='+', help='Saved page or InterviewList HTML files.')
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        start = time.perf_counter()
+        interviews = parse_interviews_html(html)
+        elapsed = time.perf_counter() - start
+        for interview in interviews:
+            print(json.dumps(interview, ensure_ascii=False))
+        print(f"{path}: {len(interviews)} interviews parsed in {elapsed * 1000:.2f} ms", file=sys.stderr)
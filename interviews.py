@@ -1,38 +1,73 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import pandas as pd
+# selenium and pandas are imported where they are used, so importing this
+# module (e.g. from batch.py or a worker process) stays fast
 import time
-import json
-import yaml
+from functools import partial
+import logging
 from argparse import ArgumentParser
-import selenium
-from selenium.common.exceptions import NoSuchElementException, NoSuchDriverException
+from cli import (add_common_arguments, check_common_arguments, close_run, open_html_cache, open_http_fetcher,
+                 open_playwright_backend, open_proxy_pool, open_record_store)
+from driver_pool import DriverPool
+from crawler import crawl_pages
+from metrics import metrics
+from sinks import Checkpoint, MultiSink, open_sink, CHECKPOINT_SUFFIX
+from record_store import company_from_url
+from http_backend import ChallengeDetected, find_challenge_marker, get_interviews_over_http
+from pacing import pacer
+from proxy_pool import chrome_proxy_server
+from resource_blocking import DEFAULT_BLOCKED_URLS, DEFAULT_PAGE_LOAD_STRATEGY, block_urls, record_driver_page_stats
+from interview_parser import page_text, parse_interviews_html, parse_total_count
 
 DEFAULT_URL = ('https://www.glassdoor.com/fake-url')
-
-parser = ArgumentParser()
-parser.add_argument('-u', '--url',
-                    help='URL of the company\'s Glassdoor interview page.',
-                    default=DEFAULT_URL)
-parser.add_argument('--headless',
-                    help='Run in headless mode',
-                    default=False,
-                    action='store_true')
-args = parser.parse_args()
-
-interviews_url = args.url
+DEFAULT_FILEPATH = 'interviews.csv'
+
+def parse_args(argv=None):
+    parser = ArgumentParser()
+    parser.add_argument('-u', '--url',
+                        help='URL of the company\'s Glassdoor interview page.',
+                        default=DEFAULT_URL)
+    parser.add_argument('-f', '--filepath',
+                        help='Path to save the interviews (.csv, .jsonl or .parquet).',
+                        default=DEFAULT_FILEPATH)
+    parser.add_argument('--headless',
+                        help='Run in headless mode',
+                        default=False,
+                        action='store_true')
+    parser.add_argument('--workers',
+                        help='Number of browser workers loading pages in parallel.',
+                        type=int,
+                        default=1)
+    parser.add_argument('--from-cache',
+                        help='Only re-parse pages from --cache-dir, without fetching anything.',
+                        action='store_true',
+                        default=False)
+    parser.add_argument('--profile-page',
+                        help='Run cProfile while fetching this page number and dump the stats to page_<n>.pstats.',
+                        type=int,
+                        default=None)
+    add_common_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.from_cache and not args.cache_dir:
+        parser.error('--from-cache requires --cache-dir')
+    return check_common_arguments(parser, args)
 
 service = None
 
-def get_driver(url=None):
+def get_driver(url=None, headless=False, proxy=None, page_load_strategy=DEFAULT_PAGE_LOAD_STRATEGY,
+               blocked_urls=DEFAULT_BLOCKED_URLS):
+    from selenium import webdriver
+    from selenium.common.exceptions import NoSuchDriverException, SessionNotCreatedException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from install_chromedriver import cached_service, get_service, invalidate_cache
+
     # Set up Selenium options
     options = Options()
     options.add_argument("--start-maximized")
-    if args.headless:
+    # Only the InterviewList DOM is read, so there is no need to wait for the load event
+    options.page_load_strategy = page_load_strategy
+    if proxy:
+        options.add_argument(f'--proxy-server={chrome_proxy_server(proxy)}')
+    if headless:
         options.add_argument("--headless")  # Uncomment for headless mode
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
@@ -43,103 +78,158 @@ def get_driver(url=None):
         )
     
     global service
+    if service is None:
+        # A chromedriver resolved by an earlier run, without asking the network again
+        service = cached_service()
     try:
         driver = webdriver.Chrome(options=options, service=service)
-    except NoSuchDriverException:
-        from install_chromedriver import get_service
+    except (NoSuchDriverException, SessionNotCreatedException) as e:
+        # No driver, or a cached one for another Chrome version (when Chrome's version could not be read)
+        print(f"Could not start Chrome ({e.msg}), resolving chromedriver again...")
+        invalidate_cache()
         service = get_service()
         driver = webdriver.Chrome(options=options, service=service)
-    wait = WebDriverWait(driver, 15)
+    block_urls(driver, blocked_urls)
+    wait = WebDriverWait(driver, pacer.profile.initial_timeout)
 
     if url:
         driver.get(url)
 
     return driver, wait
 
-def get_interviews_from_page(driver, wait):
+def get_interviews_from_page(driver, wait, html_cache=None, url=None, page_info=None):
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
     # Wait for the container to be present
-    container = wait.until(
-        EC.presence_of_element_located((By.XPATH, '//div[@data-test="InterviewList"]'))
-    )
-    # Find all divs with data-brandviews starting with "MODULE:n=interview-reviews"
-    try:
-        interview_divs = container.find_elements(
-            By.XPATH,
-            './/div[starts-with(@data-brandviews, "MODULE:n=interview-reviews")]'
-            )[::2] # the divs are duplicated, so we need to skip every other one
-    except (selenium.common.exceptions.TimeoutException, selenium.common.exceptions.NoSuchElementException):
-        print("No interview review divs found")
-        return []
-    except Exception as e:
-        print(f"Error: {e}")
-        return []
-
-    print(f"Found {len(interview_divs)} interview review divs")
-    interview_data = []
-    for div in interview_divs:
-        optional_divs = div.find_elements(By.XPATH, './/div[contains(@class, "text-with-icon")]')
-        location = None
-        for optional_div in optional_divs:
-            if optional_div.find_elements(By.CSS_SELECTOR, 'svg[class="icon_Icon__ptI3R"]'):
-                if not location:
-                    # print('location', div.text.strip())
-                    location = optional_div.text.strip()
-        interview_position = div.find_elements(By.TAG_NAME, "h3")[0].text
-        span_elements = div.find_elements(By.TAG_NAME, "span")
-        published_date = span_elements[0].text
-        candidate = span_elements[1].text
-        is_offer_received = span_elements[2].text
-        interview_experience = span_elements[3].text
-        interview_difficulty = span_elements[4].text
-
-        p_elements = div.find_elements(By.TAG_NAME, "p")
-        application_process = p_elements[1].text
-        interview_review = p_elements[3].text
-        interview_questions = [q.get_attribute('textContent') for q in div.find_elements(By.CSS_SELECTOR, 'div[data-test="question-container"] div.interview-details_interviewText__YH2ZO > p')]
+    with metrics.span('wait_container'):
         try:
-            helpful_count = div.find_element(By.CSS_SELECTOR, 'div[data-test="review-helpful-count"]').text
-        except NoSuchElementException:
-            helpful_count = 0
-       
-
-        interview_data.append({
-            "interview_position": interview_position,
-            "location": location,
-            "published_date": published_date,
-            "candidate": candidate,
-            "is_offer_received": is_offer_received,
-            "interview_experience": interview_experience,
-            "interview_difficulty": interview_difficulty,
-            "application_process": application_process,
-            "interview_review": interview_review,
-            "interview_questions": interview_questions,
-            "helpful_count": helpful_count
-        })
-        # print(interview_data[-1])
+            container = wait.until(
+                EC.presence_of_element_located((By.XPATH, '//div[@data-test="InterviewList"]'))
+            )
+        except TimeoutException:
+            marker = find_challenge_marker(driver.page_source)
+            if marker:
+                pacer.throttled(url or driver.current_url, marker)
+            raise
+    # One round-trip for the whole list, all fields are then extracted offline
+    with metrics.span('snapshot'):
+        html = container.get_attribute('outerHTML')
+    if html_cache is not None:
+        html_cache.put(url or driver.current_url, html)
+    record_driver_page_stats(driver, url)
+    if page_info is not None:
+        # The "of N interviews" count sits outside the list container
+        page_info['total_count'] = parse_total_count(driver.execute_script("return document.body.innerText"))
+    with metrics.span('parse'):
+        interview_data = parse_interviews_html(html)
+    print(f"Found {len(interview_data)} interview review divs")
     return interview_data
 
-def get_all_interviews():
-    all_interviews = []
-    url_base = interviews_url[:-4]
-    page = 1
-    while True:
+def get_interviews_with_retry(driver_pool, url, html_cache=None, page_info=None):
+    from selenium.common.exceptions import (NoSuchDriverException, SessionNotCreatedException, TimeoutException,
+                                            WebDriverException)
+    for i in range(3):
+        # Only sleeps while the host is throttling us
+        pacer.before_page(url)
+        try:
+            # A failed attempt discards the session, so retries get a fresh browser
+            with driver_pool.session() as session:
+                start = time.perf_counter()
+                with metrics.span('page_load'):
+                    session.driver.get(url)
+                interviews = get_interviews_from_page(session.driver, pacer.wait(session.driver, url),
+                                                      html_cache=html_cache, url=url, page_info=page_info)
+                pacer.loaded(url, time.perf_counter() - start)
+                return interviews
+        except (NoSuchDriverException, SessionNotCreatedException):
+            raise
+        except WebDriverException as e:
+            # Timeouts, and network errors such as a dead proxy: the next session gets another proxy
+            print(f"Error loading page: {e}, retrying for the {i+1} time...")
+            metrics.incr('retries')
+    raise TimeoutException("Failed to load page")
+
+def make_fetch_page(url, driver_pool, http_fetcher=None, playwright_backend=None, html_cache=None,
+                    from_cache=False):
+    """Returns the `fetch_page(page, page_info=None)` used to crawl the interviews at `url`."""
+    url_base = url[:-4]
+
+    def fetch_page(page, page_info=None):
+        from selenium.common.exceptions import TimeoutException
         full_url = url_base + f'_P{page}.htm'
+        if html_cache is not None:
+            html = html_cache.get(full_url, ignore_ttl=from_cache)
+            if html is not None:
+                print(f"Parsing cached interviews from {full_url}")
+                metrics.incr('cache_hits')
+                with metrics.span('parse'):
+                    if page_info is not None:
+                        page_info['total_count'] = parse_total_count(page_text(html))
+                    return parse_interviews_html(html)
+            if from_cache:
+                return []
         print(f"Getting interviews from {full_url}")
-        driver, wait = get_driver(full_url)
-        interviews_data = get_interviews_from_page(driver, wait)
-        if len(interviews_data) == 0:
-            break
-        all_interviews.extend(interviews_data)
-        page += 1
-        driver.quit()
+        if playwright_backend is not None:
+            try:
+                return playwright_backend.get_interviews(full_url, html_cache=html_cache, page_info=page_info)
+            except (TimeoutError, ConnectionError) as e:
+                print(f"{e}, skipping...")
+                return None
+        if http_fetcher is not None:
+            import requests
+            try:
+                return get_interviews_over_http(http_fetcher, full_url, html_cache=html_cache,
+                                                page_info=page_info)
+            except ChallengeDetected as e:
+                print(f"{e}, falling back to the browser...")
+                metrics.incr('http_challenges')
+            except requests.RequestException as e:
+                # Already retried if transient, the browser would not do better
+                print(f"{e}, skipping...")
+                metrics.incr('http_errors')
+                return None
+        try:
+            return get_interviews_with_retry(driver_pool, full_url, html_cache=html_cache, page_info=page_info)
+        except TimeoutException:
+            print(f"Could not load {full_url}, skipping...")
+            return None
 
-    return all_interviews
+    return fetch_page
 
-def save_interviews(interviews):
-    df = pd.DataFrame(interviews)
-    df.to_csv('interviews.csv', index=False)
+def get_all_interviews(url, driver_pool, workers=1, sink=None, checkpoint=None, http_fetcher=None,
+                       playwright_backend=None, html_cache=None, from_cache=False,
+                       is_last_page=None, profile_page=None):
+    fetch_page = make_fetch_page(url, driver_pool, http_fetcher=http_fetcher,
+                                 playwright_backend=playwright_backend, html_cache=html_cache,
+                                 from_cache=from_cache)
+    # Page 1 reads the total interview count, which bounds the rest of the crawl
+    return crawl_pages(fetch_page, workers=workers, sink=sink, checkpoint=checkpoint,
+                       is_last_page=is_last_page, profile_page=profile_page,
+                       count_pages=True, name='interviews')
 
 
 if __name__ == "__main__":
-    interviews = get_all_interviews()
-    save_interviews(interviews)
\ No newline at end of file
+    args = parse_args()
+    pacer.use_profile(args.pace)
+    # Shows the crawl progress and ETA
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    checkpoint = Checkpoint(args.filepath + CHECKPOINT_SUFFIX, args.url, resume=args.resume)
+    html_cache = open_html_cache(args)
+    record_store = open_record_store(args, 'interviews', company_from_url(args.url))
+    proxy_pool = open_proxy_pool(args)
+    http_fetcher = open_http_fetcher(args, proxy_pool)
+    playwright_backend = open_playwright_backend(args, args.headless, proxy_pool)
+    try:
+        with DriverPool(partial(get_driver, headless=args.headless,
+                                page_load_strategy=args.page_load_strategy, blocked_urls=args.blocked_urls),
+                        max_pages=args.pages_per_driver, proxy_pool=proxy_pool) as driver_pool, \
+                MultiSink(open_sink(args.filepath, append=args.resume, kind='interviews', offset=checkpoint.offset), record_store) as sink:
+            get_all_interviews(args.url, driver_pool, workers=args.workers, sink=sink, checkpoint=checkpoint,
+                               http_fetcher=http_fetcher, playwright_backend=playwright_backend,
+                               html_cache=html_cache, from_cache=args.from_cache,
+                               is_last_page=record_store.is_known_page if args.incremental else None,
+                               profile_page=args.profile_page)
+    finally:
+        close_run(args, proxy_pool, http_fetcher, playwright_backend)
+    print(f"Saved to {args.filepath}")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import cProfile
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Thread-safe run metrics: timed spans and other observed values summarized
+    as count/sum/min/max, plus plain counters. Written per run as JSON, or as
+    Prometheus text when the path ends in `.prom`.
+    """
+
+    def __init__(self, prefix='scraper'):
+        self.prefix = prefix
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self.summaries = {}
+        self.counters = Counter()
+
+    def observe(self, name, value):
+        with self._lock:
+            summary = self.summaries.get(name)
+            if summary is None:
+                self.summaries[name] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+            else:
+                summary['count'] += 1
+                summary['sum'] += value
+                summary['min'] = min(summary['min'], value)
+                summary['max'] = max(summary['max'], value)
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f'{stage}_seconds', time.perf_counter() - start)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'elapsed_seconds': time.time() - self.started_at,
+                'summaries': {name: dict(summary) for name, summary in self.summaries.items()},
+                'counters': dict(self.counters),
+            }
+
+    def to_prometheus(self):
+        data = self.to_dict()
+        lines = [f'# TYPE {self.prefix}_elapsed_seconds gauge',
+                 f'{self.prefix}_elapsed_seconds {data["elapsed_seconds"]}']
+        for name, summary in sorted(data['summaries'].items()):
+            metric = f'{self.prefix}_{name}'
+            lines.append(f'# TYPE {metric} summary')
+            lines.append(f'{metric}_count {summary["count"]}')
+            lines.append(f'{metric}_sum {summary["sum"]}')
+            for bound in ('min', 'max'):
+                lines.append(f'# TYPE {metric}_{bound} gauge')
+                lines.append(f'{metric}_{bound} {summary[bound]}')
+        for name, value in sorted(data['counters'].items()):
+            metric = f'{self.prefix}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.prom'):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+@contextmanager
+def profiled(path):
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+# Shared by the scrapers and backends of one run
+metrics = Metrics()
@@ -0,0 +1,301 @@
+import ast
+import csv
+import datetime
+import json
+import logging
+import os
+import re
+import sys
+import time
+from argparse import ArgumentParser
+from functools import lru_cache
+
+import pyarrow as pa
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Dictionary-encoded: each distinct string is stored once per column chunk
+DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+# Source text of a date or enum value that could not be parsed is kept in
+# the `<name>_raw` column next to it, which is null for parsed values
+RAW_SUFFIX = '_raw'
+DATE_FORMATS = ('%b %d, %Y', '%B %d, %Y', '%Y-%m-%d', '%m/%d/%Y', '%d %b %Y')
+HELPFUL_COUNT_PATTERN = re.compile(r'\d[\d,]*')
+
+# Icon names from review_parser.predefined_svg_elements
+ICON_VALUES = {
+    'Check': 'positive',
+    'Line': 'neutral',
+    'X': 'negative',
+    'Circle': 'no_opinion',
+}
+ENUMS = {
+    'recommend': tuple(ICON_VALUES.values()),
+    'ceo_approval': tuple(ICON_VALUES.values()),
+    'business_outlook': tuple(ICON_VALUES.values()),
+    'is_offer_received': ('Accepted offer', 'Declined offer', 'No offer'),
+    'interview_experience': ('Positive experience', 'Neutral experience', 'Negative experience'),
+    'interview_difficulty': ('Easy interview', 'Average interview', 'Difficult interview'),
+}
+
+REVIEW_SCHEMA = pa.schema([
+    ('review_title', pa.string()),
+    ('employee_status', DICTIONARY),
+    ('location', DICTIONARY),
+    ('pros', pa.string()),
+    ('cons', pa.string()),
+    ('rating', pa.float32()),
+    ('date', pa.timestamp('s')),
+    ('date_raw', DICTIONARY),
+    ('position', DICTIONARY),
+    ('recommend', DICTIONARY),
+    ('recommend_raw', DICTIONARY),
+    ('ceo_approval', DICTIONARY),
+    ('ceo_approval_raw', DICTIONARY),
+    ('business_outlook', DICTIONARY),
+    ('business_outlook_raw', DICTIONARY),
+    ('life_balance', pa.int8()),
+    ('culture_values', pa.int8()),
+    ('diversity_inclusion', pa.int8()),
+    ('career_opportunities', pa.int8()),
+    ('comp_benefits', pa.int8()),
+    ('senior_management', pa.int8()),
+    ('helpful_count', pa.int32()),
+])
+
+INTERVIEW_SCHEMA = pa.schema([
+    ('interview_position', DICTIONARY),
+    ('location', DICTIONARY),
+    ('published_date', pa.timestamp('s')),
+    ('published_date_raw', DICTIONARY),
+    ('candidate', DICTIONARY),
+    ('is_offer_received', DICTIONARY),
+    ('is_offer_received_raw', DICTIONARY),
+    ('interview_experience', DICTIONARY),
+    ('interview_experience_raw', DICTIONARY),
+    ('interview_difficulty', DICTIONARY),
+    ('interview_difficulty_raw', DICTIONARY),
+    ('application_process', pa.string()),
+    ('interview_review', pa.string()),
+    ('interview_questions', pa.list_(pa.string())),
+    ('helpful_count', pa.int32()),
+])
+
+SCHEMAS = {
+    'reviews': REVIEW_SCHEMA,
+    'interviews': INTERVIEW_SCHEMA,
+}
+
+
+def _is_missing(value):
+    # CSV round-trips turn None into '' and pandas into NaN
+    return value is None or value == '' or (isinstance(value, float) and value != value)
+
+
+def parse_float(value):
+    if _is_missing(value):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_int(value):
+    number = parse_float(value)
+    return None if number is None else int(number)
+
+
+@lru_cache(maxsize=65536)
+def _parse_date_text(text):
+    # %b only knows "Sep"
+    text = text.replace('Sept ', 'Sep ')
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format)
+        except ValueError:
+            pass
+    return None
+
+
+def parse_date(value):
+    if _is_missing(value):
+        return None
+    if isinstance(value, datetime.datetime):
+        return value
+    return _parse_date_text(str(value).strip())
+
+
+def parse_helpful_count(value):
+    """0, 3, "3" or "3 people found this helpful" -> 3."""
+    if _is_missing(value):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = HELPFUL_COUNT_PATTERN.search(str(value))
+    return int(match.group(0).replace(',', '')) if match else 0
+
+
+def parse_enum(name, value):
+    if _is_missing(value):
+        return None
+    value = ICON_VALUES.get(value, value)
+    return value if value in ENUMS[name] else None
+
+
+def parse_text(value):
+    return None if _is_missing(value) else str(value)
+
+
+def parse_list(value):
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        # Lists come back from CSV as their Python repr
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return [value]
+    return [str(item) for item in value]
+
+
+def _converter(field):
+    if field.name in ENUMS:
+        return lambda value: parse_enum(field.name, value)
+    if field.name == 'helpful_count':
+        return parse_helpful_count
+    if pa.types.is_timestamp(field.type):
+        return parse_date
+    if pa.types.is_floating(field.type):
+        return parse_float
+    if pa.types.is_integer(field.type):
+        return parse_int
+    if pa.types.is_list(field.type):
+        return parse_list
+    return parse_text
+
+
+_reported = set()
+
+
+def _report_unparsed(name, text):
+    metrics.incr('unparsed_values')
+    # Once per distinct value, a new page layout would otherwise flood the log
+    if (name, text) not in _reported:
+        _reported.add((name, text))
+        logger.warning(f"Could not parse {name} {text!r}, kept in {name}{RAW_SUFFIX}")
+
+
+def _unparsed(name, records, values):
+    raw = []
+    for record, value in zip(records, values):
+        text = record.get(name)
+        if value is not None:
+            raw.append(None)
+        elif _is_missing(text):
+            # Typed output converted again keeps what the first pass could not parse
+            raw.append(parse_text(record.get(name + RAW_SUFFIX)))
+        else:
+            text = str(text)
+            _report_unparsed(name, text)
+            raw.append(text)
+    return raw
+
+
+def to_arrow_table(kind, records):
+    """
+    Builds an Arrow table with the fixed typed schema of `kind` from scraped
+    records. Dates and enums that cannot be parsed are null, logged, counted
+    in the `unparsed_values` metric and kept as text in their `_raw` column.
+    """
+    schema = SCHEMAS[kind]
+    columns = {}
+    for field in schema:
+        if field.name.endswith(RAW_SUFFIX):
+            continue
+        convert = _converter(field)
+        columns[field.name] = [convert(record.get(field.name)) for record in records]
+        if field.name + RAW_SUFFIX in schema.names:
+            columns[field.name + RAW_SUFFIX] = _unparsed(field.name, records, columns[field.name])
+    return pa.Table.from_arrays([pa.array(columns[field.name], type=field.type) for field in schema], schema=schema)
+
+
+def to_dataframe(kind, records):
+    """Typed DataFrame: float/int/datetime columns, categoricals for the dictionary columns."""
+    import pandas as pd
+    df = to_arrow_table(kind, records).to_pandas()
+    for name, values in ENUMS.items():
+        if name in df:
+            df[name] = df[name].cat.set_categories(values, ordered=True)
+    for field in SCHEMAS[kind]:
+        # Nullable integers instead of floats with NaN
+        if pa.types.is_integer(field.type):
+            df[field.name] = df[field.name].astype(pd.Int8Dtype() if field.type == pa.int8() else pd.Int32Dtype())
+    return df
+
+
+def guess_kind(columns):
+    return 'reviews' if 'review_title' in columns else 'interviews'
+
+
+def iter_record_batches(path, batch_size):
+    """Yields lists of raw records from a .csv, .jsonl or Parquet file or dataset directory."""
+    extension = os.path.splitext(path)[1].lower()
+    if os.path.isdir(path) or extension == '.parquet':
+        import pyarrow.dataset as ds
+        for batch in ds.dataset(path, format='parquet').to_batches(batch_size=batch_size):
+            yield batch.to_pylist()
+        return
+    with open(path, newline='', encoding='utf-8') as f:
+        if extension in ('.jsonl', '.json'):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f)
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def convert(input_path, output_path, kind=None, batch_size=100_000):
+    """Streams `input_path` into a typed Parquet file; returns `(kind, rows)`."""
+    import pyarrow.parquet as pq
+    writer = None
+    rows = 0
+    try:
+        for records in iter_record_batches(input_path, batch_size):
+            kind = kind or guess_kind(records[0])
+            table = to_arrow_table(kind, records)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema, compression='zstd')
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return kind, rows
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Convert scraped reviews or interviews to typed Parquet.')
+    parser.add_argument('input', help='Scraper output: .csv, .jsonl, or a .parquet file or dataset directory.')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Parquet file to write (default: the input name with .typed.parquet).')
+    parser.add_argument('--kind', choices=sorted(SCHEMAS), default=None,
+                        help='Record kind; guessed from the columns by default.')
+    parser.add_argument('--batch-size', type=int, default=100_000,
+                        help='Records converted and written at a time.')
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.input.rstrip('/\\'))[0] + '.typed.parquet'
+    start = time.perf_counter()
+    kind, rows = convert(args.input, output, kind=args.kind, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} {kind} written to {output} in {elapsed:.2f} s", file=sys.stderr)
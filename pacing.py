@@ -0,0 +1,127 @@
+import logging
+import random
+import threading
+import time
+from collections import deque, namedtuple
+from urllib.parse import urlsplit
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Profile = namedtuple('Profile', [
+    'humanize',         # run simulate_human_interaction on every page
+    'human_delay',      # upper bound of the random pause of random_sleep, in seconds
+    'hover_pause',      # pause before hovering a subrating container, in seconds
+    'initial_timeout',  # page timeout until enough load times were seen for the host
+    'min_timeout',
+    'max_timeout',
+    'timeout_factor',   # page timeout as a multiple of the host's p95 load time
+    'element_timeout',  # timeout for elements that appear right after an interaction
+    'backoff',          # first backoff after throttling, doubled on every repeat
+    'max_backoff',
+])
+
+PROFILES = {
+    # Trusted proxies: no human simulation, tight timeouts
+    'fast': Profile(humanize=False, human_delay=0, hover_pause=0, initial_timeout=10, min_timeout=3,
+                    max_timeout=15, timeout_factor=3, element_timeout=1, backoff=2, max_backoff=60),
+    # The human-like behavior the scrapers always had
+    'stealth': Profile(humanize=True, human_delay=3, hover_pause=0.5, initial_timeout=15, min_timeout=5,
+                       max_timeout=30, timeout_factor=4, element_timeout=2, backoff=5, max_backoff=300),
+}
+DEFAULT_PROFILE = 'stealth'
+
+# Load times kept per host, and how many are needed before timeouts adapt
+LOAD_TIME_SAMPLES = 50
+MIN_LOAD_TIME_SAMPLES = 5
+POLL_FREQUENCY = 0.1
+
+
+class HostState:
+    def __init__(self):
+        self.load_times = deque(maxlen=LOAD_TIME_SAMPLES)
+        self.throttle_level = 0
+        self.resume_at = 0.0
+
+
+class Pacer:
+    """
+    Decides how long the scrapers wait, per host.
+
+    Page timeouts follow the load times observed for the host instead of a
+    fixed 15 s, and pages only wait before loading while the host is
+    throttling us, backing off exponentially on each new sign of it and
+    recovering one step per successful page. Human-like pauses come from the
+    active profile: "stealth" keeps them, "fast" drops them.
+    """
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.profile = PROFILES[profile]
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def use_profile(self, name):
+        self.profile = PROFILES[name]
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState()
+        return state
+
+    def timeout(self, url):
+        with self._lock:
+            load_times = sorted(self._host(url).load_times)
+        if len(load_times) < MIN_LOAD_TIME_SAMPLES:
+            return self.profile.initial_timeout
+        p95 = load_times[min(len(load_times) - 1, int(len(load_times) * 0.95))]
+        return min(self.profile.max_timeout, max(self.profile.min_timeout, p95 * self.profile.timeout_factor))
+
+    def wait(self, driver, url):
+        """A WebDriverWait with the current timeout for `url`'s host."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(driver, self.timeout(url), poll_frequency=POLL_FREQUENCY)
+
+    def element_wait(self, driver):
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(driver, self.profile.element_timeout, poll_frequency=POLL_FREQUENCY / 2)
+
+    def loaded(self, url, seconds):
+        """Records a successful page load, which also eases any backoff."""
+        with self._lock:
+            state = self._host(url)
+            state.load_times.append(seconds)
+            if state.throttle_level:
+                state.throttle_level -= 1
+
+    def throttled(self, url, reason=''):
+        """Backs off the host after a challenge, a 429 or a similar sign of throttling."""
+        with self._lock:
+            state = self._host(url)
+            state.throttle_level += 1
+            delay = min(self.profile.max_backoff, self.profile.backoff * 2 ** (state.throttle_level - 1))
+            delay *= random.uniform(0.5, 1)
+            state.resume_at = max(state.resume_at, time.monotonic() + delay)
+        metrics.incr('throttled')
+        logger.warning(f"Throttled by {urlsplit(url).netloc}{f' ({reason})' if reason else ''}, "
+                       f"backing off {delay:.1f}s")
+
+    def before_page(self, url):
+        """Sleeps while the host is being backed off from, otherwise returns at once."""
+        with self._lock:
+            delay = self._host(url).resume_at - time.monotonic()
+        if delay > 0:
+            with metrics.span('backoff'):
+                time.sleep(delay)
+
+    def human_delay(self):
+        return random.random() * self.profile.human_delay
+
+    def hover_pause(self):
+        if self.profile.hover_pause:
+            time.sleep(self.profile.hover_pause)
+
+
+pacer = Pacer()
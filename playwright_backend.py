@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+from http_backend import find_challenge_marker
+from metrics import metrics
+from pacing import pacer
+from proxy_pool import playwright_proxy
+from resource_blocking import (BLOCKED_RESOURCE_TYPES, DEFAULT_BLOCKED_URLS, PAGE_STATS_SCRIPT, compile_blocklist,
+                               record_page_stats)
+
+logger = logging.getLogger(__name__)
+
+REVIEWS_SELECTOR = 'div#ReviewsFeed'
+INTERVIEWS_SELECTOR = 'div[data-test="InterviewList"]'
+
+# Same bulk hover as reviews.reveal_subratings, as a promise for page.evaluate
+REVEAL_SUBRATINGS_JS = """
+    () => new Promise((resolve) => {
+        const containers = document.querySelectorAll('#ReviewsFeed li div[class*="review-rating_ratingContainer__sQ_4_"]');
+        containers.forEach((container) => {
+            container.dispatchEvent(new MouseEvent('mouseover', {bubbles: true}));
+        });
+        requestAnimationFrame(() => setTimeout(() => resolve(containers.length), 0));
+    })
+"""
+
+
+class ChallengeTimeout(TimeoutError):
+    """The container never showed up because the page is a bot check."""
+
+
+class PlaywrightBackend:
+    """
+    One Chromium process with `contexts` lightweight browser contexts, driven
+    by an asyncio loop on a background thread. At most `max_in_flight` pages
+    are open at once; `get_reviews` and `get_interviews` block the calling
+    thread, so crawl_pages workers can share the backend.
+
+    Images, media, fonts and requests matching `blocked_urls` are aborted,
+    unless `blocked_urls` is empty.
+
+    With a `proxy_pool`, each page goes through the best available proxy,
+    using one context per proxy instead of the `contexts` shared ones.
+
+    A page that cannot be loaded raises TimeoutError, or ConnectionError on
+    network errors, so callers can skip it.
+
+    Like the Selenium path, pages go through `pacer`: they wait while the
+    host is backed off, time out after the host's adaptive timeout unless a
+    fixed `timeout` is given, and back the host off on challenge pages.
+    """
+
+    def __init__(self, contexts=4, max_in_flight=8, headless=True, proxy=None, timeout=None,
+                 blocked_urls=DEFAULT_BLOCKED_URLS, proxy_pool=None):
+        self.timeout = timeout
+        self.blocked_url_pattern = compile_blocklist(blocked_urls)
+        self.proxy_pool = proxy_pool
+        self.proxy_contexts = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="playwright-loop", daemon=True)
+        self.thread.start()
+        self._run(self._start(contexts, max_in_flight, headless, proxy))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _start(self, contexts, max_in_flight, headless, proxy):
+        from playwright.async_api import async_playwright
+        self.playwright = await async_playwright().start()
+        launch_options = {"headless": headless}
+        if proxy:
+            launch_options["proxy"] = playwright_proxy(proxy)
+        self.browser = await self.playwright.chromium.launch(**launch_options)
+        self.contexts = [] if self.proxy_pool else [await self._new_context() for _ in range(contexts)]
+        self._next_context = itertools.cycle(self.contexts)
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def _new_context(self, proxy=None):
+        context = await self.browser.new_context(proxy=playwright_proxy(proxy) if proxy else None)
+        if self.blocked_url_pattern is not None:
+            await context.route('**/*', self._route)
+        return context
+
+    async def _proxy_context(self, proxy):
+        context = self.proxy_contexts.get(proxy.url)
+        if context is None:
+            context = self.proxy_contexts[proxy.url] = await self._new_context(proxy.url)
+        return context
+
+    async def _route(self, route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or self.blocked_url_pattern.match(request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _get_container_html(self, url, selector, prepare_js=None, page_info=None):
+        if self.proxy_pool is None:
+            return await self._load_container_html(next(self._next_context), url, selector, prepare_js, page_info)
+        # Waiting for a proxy token blocks, so it happens off the event loop
+        proxy = await asyncio.get_running_loop().run_in_executor(None, self.proxy_pool.acquire)
+        start = time.perf_counter()
+        try:
+            html = await self._load_container_html(await self._proxy_context(proxy), url, selector,
+                                                   prepare_js, page_info)
+        except (TimeoutError, ConnectionError) as e:
+            # Scored down like HttpFetcher's request errors, so a dead proxy cools down
+            self.proxy_pool.release(proxy, ok=False, banned=isinstance(e, ChallengeTimeout))
+            raise
+        except BaseException:
+            self.proxy_pool.release(proxy)
+            raise
+        self.proxy_pool.release(proxy, ok=True, latency=time.perf_counter() - start)
+        return html
+
+    async def _load_container_html(self, context, url, selector, prepare_js=None, page_info=None):
+        from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+        timeout_ms = (self.timeout or pacer.timeout(url)) * 1000
+        async with self.semaphore:
+            page = await context.new_page()
+            try:
+                start = time.perf_counter()
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+                container = await page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+                pacer.loaded(url, time.perf_counter() - start)
+                record_page_stats(await page.evaluate(f"() => {{ {PAGE_STATS_SCRIPT} }}"), url)
+                if prepare_js:
+                    await page.evaluate(prepare_js)
+                if page_info is not None:
+                    page_info['text'] = await page.evaluate("() => document.body.innerText")
+                return await container.evaluate("element => element.outerHTML")
+            except PlaywrightTimeoutError as e:
+                try:
+                    marker = find_challenge_marker(await page.content())
+                except PlaywrightError:
+                    marker = None
+                if marker:
+                    pacer.throttled(url, marker)
+                    raise ChallengeTimeout(f"Timed out loading {url} ({marker}): {e}") from e
+                raise TimeoutError(f"Timed out loading {url}: {e}") from e
+            except PlaywrightError as e:
+                # Navigation failures such as net::ERR_CONNECTION_REFUSED or a dead proxy
+                raise ConnectionError(f"Could not load {url}: {e}") from e
+            finally:
+                await page.close()
+
+    def get_reviews(self, url, html_cache=None, page_info=None):
+        from review_parser import parse_reviews_html, parse_total_count
+        # Sleeps on the calling worker, only while the host is throttling us
+        pacer.before_page(url)
+        with metrics.span('playwright_page'):
+            html = self._run(self._get_container_html(url, REVIEWS_SELECTOR, REVEAL_SUBRATINGS_JS, page_info))
+        if page_info is not None:
+            page_info['total_count'] = parse_total_count(page_info.pop('text'))
+        if html_cache is not None:
+            html_cache.put(url, html)
+        with metrics.span('parse'):
+            return parse_reviews_html(html)
+
+    def get_interviews(self, url, html_cache=None, page_info=None):
+        from interview_parser import parse_interviews_html, parse_total_count
+        pacer.before_page(url)
+        with metrics.span('playwright_page'):
+            html = self._run(self._get_container_html(url, INTERVIEWS_SELECTOR, page_info=page_info))
+        if page_info is not None:
+            page_info['total_count'] = parse_total_count(page_info.pop('text'))
+        if html_cache is not None:
+            html_cache.put(url, html)
+        with metrics.span('parse'):
+            return parse_interviews_html(html)
+
+    async def _stop(self):
+        await self.browser.close()
+        await self.playwright.stop()
+
+    def close(self):
+        try:
+            self._run(self._stop())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
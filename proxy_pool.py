@@ -0,0 +1,240 @@
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = 20
+DEFAULT_BURST = 3
+DEFAULT_COOLDOWN_SECONDS = 300
+DEFAULT_MAX_FAILURES_IN_ROW = 3
+DEFAULT_MAX_COOLDOWNS = 4
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+
+
+class NoProxyAvailable(Exception):
+    pass
+
+
+def load_proxies(path):
+    """Reads proxy URLs from a file, one per line; blank lines and # comments are ignored."""
+    proxies = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                proxies.append(line)
+    return proxies
+
+
+def normalize(url):
+    return url if '://' in url else 'http://' + url
+
+
+def redact(url):
+    """Drops the credentials from a proxy URL, for logs."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.hostname}:{parts.port}" if parts.port else f"{parts.scheme}://{parts.hostname}"
+
+
+def has_credentials(url):
+    return urlsplit(normalize(url)).username is not None
+
+
+def chrome_proxy_server(url):
+    """
+    The --proxy-server value for Chrome. Chrome ignores credentials in that
+    flag, so authenticated proxies are refused instead of failing every page.
+    """
+    if has_credentials(url):
+        raise ValueError(f"Chrome cannot authenticate to {redact(url)}; use the playwright backend "
+                         f"or a proxy that authorizes by IP")
+    return redact(normalize(url))
+
+
+def check_browser_proxies(urls, backend):
+    """Error message if Selenium sessions would get proxies with credentials, else None."""
+    if backend == 'playwright':
+        return None
+    credentialed = [redact(url) for url in urls if has_credentials(url)]
+    if credentialed:
+        return (f"Proxies with credentials ({', '.join(credentialed)}) only work with --backend playwright: "
+                f"Chrome ignores user:pass in --proxy-server, and the {backend} backend uses Selenium sessions")
+    return None
+
+
+def playwright_proxy(url):
+    """Splits a proxy URL into the settings dict Playwright expects."""
+    parts = urlsplit(url)
+    proxy = {"server": redact(url)}
+    if parts.username:
+        proxy["username"] = parts.username
+        proxy["password"] = parts.password or ''
+    return proxy
+
+
+class Proxy:
+    def __init__(self, url, rate, burst):
+        self.url = url
+        self.name = redact(url)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.in_use = 0
+        self.successes = 0
+        self.failures = 0
+        self.bans = 0
+        self.failures_in_row = 0
+        self.latency = None
+        self.cooldowns = 0
+        self.cooldown_until = 0.0
+        self.evicted = False
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    @property
+    def score(self):
+        # Smoothed success rate, discounted by latency and past bans
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return success_rate / (1 + (self.latency or 0)) / (1 + self.bans)
+
+    def __repr__(self):
+        return f"Proxy({self.name!r}, score={self.score:.2f})"
+
+
+class ProxyPool:
+    """
+    Rotates requests over a set of proxies.
+
+    Every proxy has a token bucket of `burst` requests refilled at
+    `requests_per_minute`, so throughput grows with the number of proxies.
+    `acquire` hands out the least used, then highest scoring proxy with a
+    token left, waiting when none has one; the caller then reports the
+    outcome with `release`. After `max_failures_in_row` failures, or one ban,
+    a proxy is taken out of rotation for `cooldown` seconds, doubling each
+    time, and dropped for good after `max_cooldowns` cooldowns.
+    """
+
+    def __init__(self, urls, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST,
+                 cooldown=DEFAULT_COOLDOWN_SECONDS, max_failures_in_row=DEFAULT_MAX_FAILURES_IN_ROW,
+                 max_cooldowns=DEFAULT_MAX_COOLDOWNS):
+        if not urls:
+            raise ValueError("ProxyPool needs at least one proxy")
+        self.proxies = [Proxy(url, requests_per_minute / 60, burst) for url in dict.fromkeys(map(normalize, urls))]
+        self.cooldown = cooldown
+        self.max_failures_in_row = max_failures_in_row
+        self.max_cooldowns = max_cooldowns
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return len(self.proxies)
+
+    def _is_ready(self, proxy, now):
+        return not proxy.evicted and proxy.cooldown_until <= now
+
+    def _wait_time(self, proxies, now):
+        # Until the next token or the end of the next cooldown
+        waits = []
+        for proxy in proxies:
+            if proxy.cooldown_until > now:
+                waits.append(proxy.cooldown_until - now)
+            else:
+                waits.append((1 - proxy.tokens) / proxy.rate)
+        return max(0.01, min(waits))
+
+    def acquire(self, timeout=None):
+        """Takes a token from the best available proxy and marks it in use."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                live = [proxy for proxy in self.proxies if not proxy.evicted]
+                if not live:
+                    raise NoProxyAvailable("Every proxy has been evicted")
+                ready = [proxy for proxy in live if self._is_ready(proxy, now)]
+                for proxy in ready:
+                    proxy.refill(now)
+                candidates = [proxy for proxy in ready if proxy.tokens >= 1]
+                if candidates:
+                    proxy = min(candidates, key=lambda p: (p.in_use, -p.score))
+                    proxy.tokens -= 1
+                    proxy.in_use += 1
+                    return proxy
+                wait = self._wait_time(live, now)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise NoProxyAvailable(f"No proxy became available within {timeout}s")
+                    wait = min(wait, deadline - now)
+                with metrics.span('proxy_wait'):
+                    self._condition.wait(wait)
+
+    def take_token(self, proxy):
+        """
+        Waits for the next token of a proxy that is already in use. Returns
+        False, without waiting, once the proxy is out of rotation.
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if not self._is_ready(proxy, now):
+                    return False
+                proxy.refill(now)
+                if proxy.tokens >= 1:
+                    proxy.tokens -= 1
+                    return True
+                with metrics.span('proxy_wait'):
+                    self._condition.wait((1 - proxy.tokens) / proxy.rate)
+
+    def report(self, proxy, ok, latency=None, banned=False):
+        """Records the outcome of one request through `proxy`."""
+        with self._condition:
+            if latency is not None:
+                proxy.latency = latency if proxy.latency is None else (
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * proxy.latency)
+            if ok:
+                proxy.successes += 1
+                proxy.failures_in_row = 0
+                return
+            proxy.failures += 1
+            proxy.failures_in_row += 1
+            metrics.incr('proxy_failures')
+            if banned:
+                proxy.bans += 1
+                metrics.incr('proxy_bans')
+            if banned or proxy.failures_in_row >= self.max_failures_in_row:
+                self._cool_down(proxy)
+            self._condition.notify_all()
+
+    def _cool_down(self, proxy):
+        proxy.cooldowns += 1
+        proxy.failures_in_row = 0
+        if proxy.cooldowns > self.max_cooldowns:
+            proxy.evicted = True
+            metrics.incr('proxy_evictions')
+            logger.warning(f"Evicting {proxy.name} after {self.max_cooldowns} cooldowns")
+            return
+        seconds = self.cooldown * 2 ** (proxy.cooldowns - 1)
+        proxy.cooldown_until = time.monotonic() + seconds
+        metrics.incr('proxy_cooldowns')
+        logger.warning(f"Cooling down {proxy.name} for {seconds:.0f}s")
+
+    def release(self, proxy, ok=None, latency=None, banned=False):
+        """Marks `proxy` as no longer in use, reporting an outcome unless `ok` is None."""
+        if ok is not None:
+            self.report(proxy, ok, latency=latency, banned=banned)
+        with self._condition:
+            proxy.in_use -= 1
+            self._condition.notify_all()
+
+    def log_summary(self):
+        for proxy in sorted(self.proxies, key=lambda p: -p.score):
+            latency = f"{proxy.latency:.2f}s" if proxy.latency is not None else '-'
+            logger.info(f"{proxy.name}: {proxy.successes} ok, {proxy.failures} failed, {proxy.bans} banned, "
+                        f"latency {latency}, score {proxy.score:.2f}{', evicted' if proxy.evicted else ''}")
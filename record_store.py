@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+# Identity of a record. Helpful counts change over time, and subratings and
+# icons depend on a best-effort hover and on the backend, so they are left out.
+HASH_FIELDS = {
+    'reviews': ('review_title', 'date', 'position', 'location', 'pros', 'cons', 'rating'),
+    'interviews': ('interview_position', 'published_date', 'location', 'candidate', 'application_process',
+                   'interview_review', 'interview_questions'),
+}
+DATE_FIELDS = {
+    'reviews': 'date',
+    'interviews': 'published_date',
+}
+
+
+def record_hash(record, fields):
+    stable = {key: record.get(key) for key in fields}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def iso_date(value):
+    """'Jan 5, 2024' -> '2024-01-05', so the date index sorts; None if it cannot be parsed."""
+    from normalize import parse_date
+    date = parse_date(value)
+    return date.date().isoformat() if date is not None else None
+
+
+def company_from_url(url):
+    name = os.path.basename(urlparse(url).path)
+    if name.endswith('.htm'):
+        name = name[:-4]
+    return re.sub(r'_P\d+$', '', name)
+
+
+class RecordStore:
+    """
+    SQLite store of every review or interview seen for a company, keyed by a
+    content hash, used to stop an incremental crawl at the first page made
+    only of records stored by earlier runs.
+    """
+
+    def __init__(self, path, kind, company):
+        self.table = kind
+        self.hash_fields = HASH_FIELDS[kind]
+        self.date_field = DATE_FIELDS[kind]
+        self.company = company
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                company TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                date TEXT,
+                first_seen REAL NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (company, hash)
+            );
+            CREATE INDEX IF NOT EXISTS {self.table}_hash ON {self.table} (hash);
+            CREATE INDEX IF NOT EXISTS {self.table}_company_date ON {self.table} (company, date);
+        """)
+
+    def is_known_page(self, records):
+        hashes = [record_hash(record, self.hash_fields) for record in records]
+        with self._lock:
+            placeholders = ','.join('?' * len(hashes))
+            (count,) = self.connection.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE company = ? AND hash IN ({placeholders})",
+                [self.company, *hashes],
+            ).fetchone()
+        return count == len(set(hashes))
+
+    def write_page(self, page, records):
+        now = time.time()
+        rows = [(self.company, record_hash(record, self.hash_fields), iso_date(record.get(self.date_field)),
+                 now, json.dumps(record, ensure_ascii=False))
+                for record in records]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR IGNORE INTO {self.table} (company, hash, date, first_seen, record) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,87 @@
+import logging
+import re
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+DEFAULT_PAGE_LOAD_STRATEGY = 'eager'
+
+# Chrome DevTools URL patterns, '*' matches any run of characters
+DEFAULT_BLOCKED_URLS = (
+    # images
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.ico*', '*.svg*',
+    # media
+    '*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*',
+    # fonts
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*',
+    # third-party ads and analytics
+    '*doubleclick.net*', '*googlesyndication.com*', '*google-analytics.com*', '*googletagmanager.com*',
+    '*googleadservices.com*', '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*',
+    '*scorecardresearch.com*', '*quantserve.com*', '*amazon-adsystem.com*', '*adnxs.com*',
+    '*criteo.com*', '*taboola.com*', '*optimizely.com*', '*segment.io*', '*newrelic.com*',
+    '*nr-data.net*', '*ads.linkedin.com*',
+)
+
+# Request types Playwright can block beyond the URL patterns
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# Bytes over the wire and navigation timings of the current document
+PAGE_STATS_SCRIPT = """
+    var navigation = performance.getEntriesByType('navigation')[0];
+    var resources = performance.getEntriesByType('resource');
+    var bytes = navigation ? navigation.transferSize : 0;
+    for (var i = 0; i < resources.length; i++) {
+        bytes += resources[i].transferSize || 0;
+    }
+    return {
+        bytes: bytes,
+        requests: resources.length + 1,
+        dom_content_loaded_ms: navigation ? navigation.domContentLoadedEventEnd - navigation.startTime : null
+    };
+"""
+
+
+def load_blocklist(path):
+    """Reads URL patterns from a file, one per line; blank lines and # comments are ignored."""
+    with open(path, encoding='utf-8') as f:
+        lines = (line.split('#', 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+def compile_blocklist(patterns):
+    """Returns a regex matching any URL one of the DevTools-style `patterns` matches."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(re.escape(pattern).replace(r'\*', '.*') for pattern in patterns))
+
+
+def block_urls(driver, patterns):
+    """Blocks requests matching `patterns` in a Selenium Chrome driver, through CDP."""
+    if not patterns:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+def record_page_stats(stats, url):
+    """Adds the result of PAGE_STATS_SCRIPT to the run metrics and logs it."""
+    if not stats:
+        return
+    metrics.incr('bytes_received', stats['bytes'])
+    metrics.observe('page_bytes', stats['bytes'])
+    metrics.observe('page_requests', stats['requests'])
+    if stats.get('dom_content_loaded_ms') is not None:
+        metrics.observe('dom_content_loaded_seconds', stats['dom_content_loaded_ms'] / 1000)
+    logger.info(f"{url}: {stats['bytes'] / 1024:.0f} KiB in {stats['requests']} requests, "
+                f"DOMContentLoaded after {(stats.get('dom_content_loaded_ms') or 0) / 1000:.2f}s")
+
+
+def record_driver_page_stats(driver, url=None):
+    try:
+        stats = driver.execute_script(PAGE_STATS_SCRIPT)
+    except Exception as e:
+        logger.warning(f"Could not read page stats: {e}")
+        return
+    record_page_stats(stats, url or driver.current_url)
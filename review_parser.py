@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+from argparse import ArgumentParser
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+x_svg = '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24"><path fill="currentColor" fill-rule="evenodd" d="M18.299 5.327a1.5 1.5 0 0 1 0 2.121l-4.052 4.051 4.052 4.053a1.5 1.5 0 0 1-2.121 2.121l-4.053-4.052-4.051 4.052a1.5 1.5 0 0 1-2.122-2.121l4.052-4.053-4.052-4.051a1.5 1.5 0 1 1 2.122-2.121l4.05 4.051 4.054-4.051a1.5 1.5 0 0 1 2.12 0"></path></svg>'
+line_svg = '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24"><rect width="17.461" height="3" x="3.395" y="10" fill="currentColor" fill-rule="evenodd" rx="1.5"></rect></svg>'
+check_svg = '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24"><path fill="currentColor" fill-rule="evenodd" d="m8.835 17.64-3.959-3.545a1.19 1.19 0 0 1 0-1.735 1.326 1.326 0 0 1 1.816 0l3.058 2.677 7.558-8.678a1.326 1.326 0 0 1 1.816 0 1.19 1.19 0 0 1 0 1.736l-8.474 9.546a1.326 1.326 0 0 1-1.815 0"></path></svg>'
+circle_svg = '<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24"><circle cx="12" cy="12" r="7.5" fill="none" stroke="currentColor" stroke-width="3"></circle></svg>'
+predefined_svg_elements = {
+    "X": x_svg,
+    "Line": line_svg,
+    "Check": check_svg,
+    "Circle": circle_svg
+}
+
+# e.g. "Showing 1 - 10 of 1,234 reviews" in the feed header/footer
+TOTAL_COUNT_PATTERN = re.compile(r'\bof\s+([\d,]+)\s+reviews\b', re.IGNORECASE)
+
+SUBRATING_KEYS = (
+    "life_balance",
+    "culture_values",
+    "diversity_inclusion",
+    "career_opportunities",
+    "comp_benefits",
+    "senior_management",
+)
+
+
+def svg_fingerprint(svg):
+    # BeautifulSoup serializes attributes in sorted order, so only the shape matters
+    normalized = ''.join(str(svg).split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+# Normalized and hashed once, icons are then classified with a dict lookup
+svg_fingerprints = {svg_fingerprint(BeautifulSoup(svg_value, 'html.parser').svg): rating_value
+                    for rating_value, svg_value in predefined_svg_elements.items()}
+
+# Fingerprints of icon shapes not in predefined_svg_elements, with their markup
+unknown_svg_fingerprints = {}
+
+
+def classify_svg(svg):
+    if svg is None:
+        return None
+    fingerprint = svg_fingerprint(svg)
+    rating_value = svg_fingerprints.get(fingerprint)
+    if rating_value is None and fingerprint not in unknown_svg_fingerprints:
+        unknown_svg_fingerprints[fingerprint] = str(svg)
+        logger.warning(f"Unknown icon fingerprint {fingerprint}: {svg}")
+    return rating_value
+
+
+def get_review_title(review_static):
+    return review_static.find('h3').get_text(strip=True) if review_static.find('h3') else None
+
+
+def get_employee_status_and_location(review_static):
+    divs = review_static.find_all('div', class_="text-with-icon_TextWithIcon__5ZZqT")
+    employee_status = None
+    location = None
+    for div in divs:
+        if div.find('svg', class_='icon_Icon__ptI3R'):
+            if not location:
+                location = div.get_text(strip=True)
+        else:
+            if not employee_status:
+                employee_status = div.get_text(strip=True)
+    return employee_status, location
+
+
+def find_all_outside_popup(review_static, name):
+    # Revealed subrating popups must not shift the positional fields
+    return [element for element in review_static.find_all(name) if not element.find_parent('aside')]
+
+
+def get_pros_cons(review_static):
+    p_elements = find_all_outside_popup(review_static, 'p')
+    pros = p_elements[1].get_text(strip=True) if len(p_elements) > 1 else None
+    cons = p_elements[3].get_text(strip=True) if len(p_elements) > 3 else None
+    return pros, cons
+
+
+def get_spans_data(review_static):
+    spans = find_all_outside_popup(review_static, 'span')
+    rating = spans[0].get_text(strip=True) if len(spans) > 0 else None
+    date = spans[1].get_text(strip=True) if len(spans) > 1 else None
+    position = spans[3].get_text(strip=True) if len(spans) > 3 else None
+    return rating, date, position
+
+
+def get_helpful_count(review_static):
+    helpful_div = review_static.find('div', attrs={'data-test': 'review-helpful-count'})
+    return helpful_div.get_text(strip=True) if helpful_div else 0
+
+
+def get_subratings_container(review_static):
+    return review_static.find('div', class_=lambda c: c and 'review-rating_ratingContainer__sQ_4_' in c)
+
+
+def get_subratings(review_static):
+    # Only present when the popup was rendered before the snapshot was taken
+    subrating_map = dict.fromkeys(SUBRATING_KEYS)
+    container = get_subratings_container(review_static)
+    popup = container.find('aside') if container else None
+    if popup:
+        subratings = popup.find_all(lambda tag: tag.name == 'div' and tag.get('class') == ['review-rating_subRating__0Q_Z0'])
+        for subrating_key, subrating_div in zip(SUBRATING_KEYS, subratings):
+            subrating_map[subrating_key] = 5 - subrating_div.decode_contents().count('RatingStarOutline')
+    return subrating_map
+
+
+def get_svg_map(review_static):
+    svgs = review_static.select('.review-details_experienceContainer__2W06X svg')
+    svgs += [None] * (3 - len(svgs))
+    return {
+        "recommend": classify_svg(svgs[0]),
+        "ceo_approval": classify_svg(svgs[1]),
+        "business_outlook": classify_svg(svgs[2]),
+    }
+
+
+def is_missing_subratings(review_static, review):
+    return (get_subratings_container(review_static) is not None
+            and all(review[key] is None for key in SUBRATING_KEYS))
+
+
+def parse_review(review_static):
+    review_title = get_review_title(review_static)
+    employee_status, location = get_employee_status_and_location(review_static)
+    pros, cons = get_pros_cons(review_static)
+    rating, date, position = get_spans_data(review_static)
+    helpful_count = get_helpful_count(review_static)
+    subrating_map = get_subratings(review_static)
+    svg_map = get_svg_map(review_static)
+
+    return {
+        "review_title": review_title,
+        "employee_status": employee_status,
+        "location": location,
+        "pros": pros,
+        "cons": cons,
+        "rating": rating,
+        "date": date,
+        "position": position,
+        "recommend": svg_map["recommend"],
+        "ceo_approval": svg_map["ceo_approval"],
+        "business_outlook": svg_map["business_outlook"],
+        "life_balance": subrating_map["life_balance"],
+        "culture_values": subrating_map["culture_values"],
+        "diversity_inclusion": subrating_map["diversity_inclusion"],
+        "career_opportunities": subrating_map["career_opportunities"],
+        "comp_benefits": subrating_map["comp_benefits"],
+        "senior_management": subrating_map["senior_management"],
+        "helpful_count": helpful_count,
+    }
+
+
+def get_review_items(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    reviews_feed = soup.find('div', id='ReviewsFeed') or soup
+    return reviews_feed.find_all('li')
+
+
+def parse_total_count(text):
+    match = TOTAL_COUNT_PATTERN.search(text or '')
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def page_text(html):
+    return BeautifulSoup(html, 'html.parser').get_text(' ')
+
+
+def parse_reviews_html(html):
+    """
+    Extracts review records from the outerHTML of the ReviewsFeed container,
+    or from a full saved page that contains it.
+    """
+    return [parse_review(review_static) for review_static in get_review_items(html)]
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description='Parse reviews from saved Glassdoor HTML files.')
+    parser.add_argument('files', nargs='+', help='Saved page or ReviewsFeed HTML files.')
+    args = parser.parse_args()
+
+    for path in args.files:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        start = time.perf_counter()
+        reviews = parse_reviews_html(html)
+        elapsed = time.perf_counter() - start
+        for review in reviews:
+            print(json.dumps(review, ensure_ascii=False))
+        print(f"{path}: {len(reviews)} reviews parsed in {elapsed * 1000:.2f} ms", file=sys.stderr)
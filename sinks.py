@@ -0,0 +1,192 @@
+import csv
+import json
+import os
+
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+
+
+def truncate(path, offset):
+    """Drops whatever a crash left after the last checkpointed page."""
+    if offset is not None and os.path.exists(path) and os.path.getsize(path) > offset:
+        with open(path, 'r+b') as f:
+            f.truncate(offset)
+
+
+class JsonlSink:
+    def __init__(self, path, append=False, offset=None):
+        self.path = path
+        if append:
+            truncate(path, offset)
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write_page(self, page, records):
+        for record in records:
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def position(self):
+        """Size of the output once the pages written so far are flushed."""
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvSink(JsonlSink):
+    def __init__(self, path, append=False, offset=None):
+        fieldnames = None
+        if append:
+            truncate(path, offset)
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, newline='', encoding='utf-8') as f:
+                fieldnames = next(csv.reader(f), None)
+        super().__init__(path, append=append, offset=offset)
+        self.writer = None
+        if fieldnames:
+            self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, extrasaction='ignore')
+
+    def write_page(self, page, records):
+        if not records:
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(records[0]), extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerows(records)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+
+class ParquetSink:
+    """
+    Writes a Parquet dataset directory with one part file per page, so a
+    finished page is never lost or half-written and the directory can be read
+    back with `pandas.read_parquet(path)`.
+
+    With a `kind` ('reviews' or 'interviews') the parts use the typed schema
+    from normalize.py; without one every scalar is stored as a string.
+    """
+
+    def __init__(self, path, append=False, kind=None):
+        self.path = path
+        self.kind = kind
+        os.makedirs(path, exist_ok=True)
+        if not append:
+            for name in os.listdir(path):
+                if name.startswith('part-') and name.endswith('.parquet'):
+                    os.remove(os.path.join(path, name))
+
+    def to_table(self, records):
+        if self.kind is not None:
+            from normalize import to_arrow_table
+            return to_arrow_table(self.kind, records)
+        import pyarrow as pa
+        # Fields such as helpful_count mix ints and text, keep every scalar as a string
+        columns = {}
+        for key in records[0]:
+            values = [record.get(key) for record in records]
+            if any(isinstance(value, list) for value in values):
+                columns[key] = pa.array(values, type=pa.list_(pa.string()))
+            else:
+                columns[key] = pa.array([None if value is None else str(value) for value in values],
+                                        type=pa.string())
+        return pa.table(columns)
+
+    def write_page(self, page, records):
+        import pyarrow.parquet as pq
+        if not records:
+            return
+        part_path = os.path.join(self.path, f'part-{page:05d}.parquet')
+        tmp_path = part_path + '.tmp'
+        pq.write_table(self.to_table(records), tmp_path)
+        os.replace(tmp_path, part_path)
+
+    def position(self):
+        # Part files are written whole and named by page, a rewritten page replaces its part
+        return None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MultiSink:
+    def __init__(self, *sinks):
+        self.sinks = [sink for sink in sinks if sink is not None]
+
+    def write_page(self, page, records):
+        for sink in self.sinks:
+            sink.write_page(page, records)
+
+    def position(self):
+        # The output file comes first, the record store deduplicates on its own
+        return self.sinks[0].position() if self.sinks and hasattr(self.sinks[0], 'position') else None
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_sink(path, append=False, kind=None, offset=None):
+    """
+    Opens the output for `path`'s extension. When appending, `offset` (from
+    Checkpoint.offset) truncates rows written after the last checkpointed
+    page, so a page interrupted before its checkpoint is not written twice.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.json'):
+        return JsonlSink(path, append=append, offset=offset)
+    if extension == '.parquet':
+        return ParquetSink(path, append=append, kind=kind)
+    return CsvSink(path, append=append, offset=offset)
+
+
+class Checkpoint:
+    """
+    Manifest of pages already written to the output, so that a resumed run
+    skips them. A page is marked done only after its records are flushed,
+    together with the output size at that point: `offset` is where a resumed
+    run truncates the output, or None when unknown.
+    """
+
+    def __init__(self, path, url, resume=False):
+        self.path = path
+        self.url = url
+        self.completed_pages = set()
+        self.offset = None if resume else 0
+        if resume and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('url') != url:
+                raise ValueError(f"Checkpoint {path} belongs to {manifest.get('url')}, not {url}")
+            self.completed_pages = set(manifest.get('completed_pages', []))
+            self.offset = manifest.get('offset')
+        self.save()
+
+    def mark_done(self, page, offset=None):
+        self.completed_pages.add(page)
+        self.offset = offset
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'url': self.url, 'completed_pages': sorted(self.completed_pages), 'offset': self.offset}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+# The scrapers are flat top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import FixtureServer  # noqa: E402
+
+
+class RecordingFixtureServer(FixtureServer):
+    """FixtureServer that remembers the paths it served and can drop some pages."""
+
+    def __init__(self, *args, missing_pages=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.missing_pages = set(missing_pages)
+        self.paths = []
+
+    def render(self, path):
+        self.paths.append(path)
+        if any(path.endswith(f'_P{page}.htm') for page in self.missing_pages):
+            return None
+        return super().render(path)
+
+    def pages_served(self):
+        """Page numbers requested so far, in request order."""
+        return [int(path.rsplit('_P', 1)[1][:-4]) for path in self.paths]
+
+
+@pytest.fixture
+def fixture_server_factory():
+    servers = []
+
+    def start(**kwargs):
+        server = RecordingFixtureServer(**kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def http_fetcher():
+    import http_backend
+    from http_backend import HttpFetcher
+    retry_delay = http_backend.RETRY_DELAY
+    http_backend.RETRY_DELAY = 0
+    with HttpFetcher(pool_size=4) as fetcher:
+        yield fetcher
+    http_backend.RETRY_DELAY = retry_delay
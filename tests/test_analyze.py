@@ -0,0 +1,40 @@
+import csv
+
+import pytest
+
+from analyze import analyze
+
+
+def write_csv(path, fieldnames, rows=()):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.mark.parametrize('kind, fieldnames', [
+    ('reviews', ['review_title', 'rating', 'date', 'location']),
+    ('interviews', ['interview_position', 'published_date', 'interview_difficulty']),
+])
+def test_header_only_csv(kind, fieldnames, tmp_path):
+    results, _ = analyze(write_csv(tmp_path / 'empty.csv', fieldnames), cache_dir=None)
+    assert results['kind'] == kind
+    assert results['tables']['by_position'] == []
+
+
+def test_empty_jsonl(tmp_path):
+    path = tmp_path / 'empty.jsonl'
+    path.write_text('')
+    results, _ = analyze(str(path), kind='interviews', cache_dir=None)
+    assert results['tables']['overall'][0]['interviews'] == 0
+
+
+def test_every_location_missing(tmp_path):
+    rows = [{'review_title': 'Fine', 'rating': '4', 'date': 'Jan 5, 2024', 'position': 'Analyst', 'location': ''},
+            {'review_title': 'Meh', 'rating': '2', 'date': 'Feb 1, 2024', 'position': '', 'location': ''}]
+    path = write_csv(tmp_path / 'reviews.csv', rows[0].keys(), rows)
+    tables = analyze(path, cache_dir=None)[0]['tables']
+    assert tables['by_location'] == []
+    assert [row['position'] for row in tables['by_position']] == ['Analyst']
+    assert [row['reviews'] for row in tables['monthly_ratings']] == [1, 1]
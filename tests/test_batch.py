@@ -0,0 +1,45 @@
+import json
+
+import batch
+from crawler import PageCrawl, run_crawls
+
+
+def test_listing_that_cannot_open_is_reported_and_the_rest_run(fixture_server_factory, http_fetcher, tmp_path):
+    server = fixture_server_factory(total_pages=2, per_page=3)
+    names = ['A', 'B', 'C', 'D', 'E']
+    jobs = [('reviews', f'{server.base_url}/Reviews/{name}-Reviews-E1.htm') for name in names]
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    # B's checkpoint belongs to another listing, so --resume refuses to open it
+    with open(output_dir / 'B-Reviews-E1.csv.checkpoint.json', 'w', encoding='utf-8') as f:
+        json.dump({'url': 'elsewhere', 'completed_pages': []}, f)
+    urls_file = tmp_path / 'urls.txt'
+    urls_file.write_text('')
+    args = batch.parse_args([str(urls_file), '-o', str(output_dir), '--backend', 'http', '--resume',
+                             '--workers', '2'])
+
+    failed = batch.run_batch(jobs, args, {'reviews': None, 'interviews': None}, http_fetcher=http_fetcher)
+    assert failed == ['B-Reviews-E1']
+    for name in ['A', 'C', 'D', 'E']:
+        with open(output_dir / f'{name}-Reviews-E1.csv', encoding='utf-8') as f:
+            assert len(f.readlines()) == 1 + 6
+
+
+def test_run_crawls_round_robin_and_retirement():
+    order = []
+    finished = []
+
+    def make_fetch_page(name, pages):
+        def fetch_page(page):
+            order.append((name, page))
+            return [{'name': name, 'page': page}] if page <= pages else []
+        return fetch_page
+
+    crawls = (PageCrawl(make_fetch_page(name, pages), name=name) for name, pages in (('a', 2), ('b', 3), ('c', 1)))
+    run_crawls(crawls, workers=1, max_active=2, on_finished=lambda crawl: finished.append(crawl.name))
+
+    # a and b alternate; c is only pulled in once a has finished
+    assert order[:4] == [('a', 1), ('b', 1), ('a', 2), ('b', 2)]
+    assert order.index(('c', 1)) > order.index(('a', 3))
+    assert sorted(finished) == ['a', 'b', 'c']
+    assert finished[0] == 'a'
@@ -0,0 +1,22 @@
+import batch
+import interviews
+import reviews
+
+COMMON_ARGV = ['--backend', 'http', '--db', 'records.db', '--incremental', '--no-blocking', '--pace', 'fast']
+
+
+def test_scripts_share_the_common_options(tmp_path):
+    urls_file = tmp_path / 'urls.txt'
+    urls_file.write_text('')
+    parsed = [reviews.parse_args(COMMON_ARGV), interviews.parse_args(COMMON_ARGV),
+              batch.parse_args([str(urls_file)] + COMMON_ARGV)]
+    for args in parsed:
+        assert (args.backend, args.incremental, args.blocked_urls, args.pace, args.proxies) == \
+            ('http', True, [], 'fast', [])
+
+
+def test_proxy_file_and_proxy_are_combined(tmp_path):
+    proxy_file = tmp_path / 'proxies.txt'
+    proxy_file.write_text('10.0.0.1:8080\n# spare\n10.0.0.2:8080\n')
+    args = interviews.parse_args(['--proxy-file', str(proxy_file), '--proxy', 'http://10.0.0.3:8080'])
+    assert args.proxies == ['10.0.0.1:8080', '10.0.0.2:8080', 'http://10.0.0.3:8080']
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+
+import pytest
+
+import interviews
+import reviews
+from crawler import crawl_pages
+from sinks import Checkpoint, open_sink
+
+
+def test_crawl_is_bounded_by_total_count(fixture_server_factory, http_fetcher):
+    server = fixture_server_factory(total_pages=7, per_page=10)
+    records = reviews.get_all_reviews(server.reviews_url, None, workers=3, http_fetcher=http_fetcher)
+    assert len(records) == 70
+    # Page 1 tells the count, no page past the end is probed
+    assert sorted(server.pages_served()) == list(range(1, 8))
+
+
+def test_interview_crawl_is_bounded_by_total_count(fixture_server_factory, http_fetcher):
+    server = fixture_server_factory(total_pages=4, per_page=5)
+    records = interviews.get_all_interviews(server.interviews_url, None, workers=2, http_fetcher=http_fetcher)
+    assert len(records) == 20
+    assert sorted(server.pages_served()) == [1, 2, 3, 4]
+
+
+def test_failures_in_a_row_end_a_crawl_without_page_count():
+    fetched = []
+
+    def fetch_page(page):
+        fetched.append(page)
+        return None
+
+    assert crawl_pages(fetch_page, max_skipped_in_row=5) == []
+    assert fetched == [1, 2, 3, 4, 5]
+
+
+def test_pages_wait_for_the_page_count():
+    calls = []
+    lock = threading.Lock()
+
+    def fetch_page(page, page_info=None):
+        with lock:
+            calls.append(('start', page))
+        if page_info is not None:
+            time.sleep(0.05)
+            page_info['total_count'] = 25
+        with lock:
+            calls.append(('end', page))
+        return [{'page': page}] * 10
+
+    records = crawl_pages(fetch_page, workers=4, count_pages=True)
+    assert len(records) == 30
+    # No other page starts before the first one tells how many there are
+    assert calls[:2] == [('start', 1), ('end', 1)]
+    assert sorted(page for event, page in calls if event == 'start') == [1, 2, 3]
+
+
+def test_progress_counts_checkpointed_pages_once(tmp_path, caplog):
+    def fetch_page(page, page_info=None):
+        if page_info is not None:
+            page_info['total_count'] = 30
+        return [{'page': page}] * 3 if page <= 10 else []
+
+    checkpoint = Checkpoint(str(tmp_path / 'out.jsonl.checkpoint.json'), 'listing')
+    with open_sink(str(tmp_path / 'out.jsonl')) as sink, caplog.at_level(logging.INFO, logger='crawler'):
+        crawl_pages(fetch_page, sink=sink, checkpoint=checkpoint, count_pages=True)
+    progress = [record.message.split(' pages done')[0] for record in caplog.records
+                if 'pages done' in record.message]
+    assert progress == [f'crawl: {page}/10' for page in range(1, 11)]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_workers_fetch_each_page_once_and_keep_page_order(workers):
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch_page(page):
+        with lock:
+            fetched.append(page)
+        # Later pages finish first
+        time.sleep(0.01 * (12 - page) if page <= 12 else 0)
+        return [{'page': page}] if page <= 12 else []
+
+    records = crawl_pages(fetch_page, workers=workers)
+    assert [record['page'] for record in records] == list(range(1, 13))
+    assert sorted(page for page in fetched if page <= 12) == list(range(1, 13))
+
+
+def test_errors_are_kept_on_the_crawl_and_reraised():
+    def fetch_page(page):
+        if page == 2:
+            raise ValueError('broken page')
+        return [{'page': page}] if page < 5 else []
+
+    with pytest.raises(ValueError, match='broken page'):
+        crawl_pages(fetch_page)
+
+
+class FailingSink:
+    def write_page(self, page, records):
+        if page == 2:
+            raise OSError('disk full')
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_sink_errors_end_the_crawl_and_are_reraised(workers):
+    def fetch_page(page):
+        return [{'page': page}] if page < 6 else []
+
+    errors = []
+
+    def crawl():
+        try:
+            crawl_pages(fetch_page, workers=workers, sink=FailingSink())
+        except OSError as e:
+            errors.append(e)
+
+    # A hang would otherwise block the whole test run
+    thread = threading.Thread(target=crawl, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert [str(e) for e in errors] == ['disk full']
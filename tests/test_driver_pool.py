@@ -0,0 +1,48 @@
+import pytest
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(len(self.drivers) + 1)
+        self.drivers.append(driver)
+        return driver, None
+
+
+def test_sessions_are_reused_then_recycled_after_max_pages():
+    factory = FakeFactory()
+    with DriverPool(factory, max_pages=3) as pool:
+        used = []
+        for _ in range(7):
+            with pool.session() as session:
+                used.append(session.driver.number)
+    assert used == [1, 1, 1, 2, 2, 2, 3]
+    # Recycled drivers are quit right away, the idle one on close
+    assert [driver.quit_calls for driver in factory.drivers] == [1, 1, 1]
+
+
+def test_session_is_discarded_when_the_block_raises():
+    factory = FakeFactory()
+    pool = DriverPool(factory, max_pages=10)
+    with pytest.raises(RuntimeError):
+        with pool.session():
+            raise RuntimeError('page crashed')
+    assert factory.drivers[0].quit_calls == 1
+
+    with pool.session() as session:
+        assert session.driver.number == 2
+    pool.close()
+    assert factory.drivers[1].quit_calls == 1
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+import interview_parser
+import review_parser
+from fixture_server import FixtureServer, REVIEWS_PATH, render_page
+
+
+def test_recorded_pages_are_served_from_a_relative_fixtures_dir(tmp_path, monkeypatch):
+    recorded = tmp_path / 'fx' / REVIEWS_PATH.lstrip('/')
+    recorded.parent.mkdir(parents=True)
+    recorded.write_text('recorded', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    assert FixtureServer(fixtures_dir='fx').render(REVIEWS_PATH) == 'recorded'
+    # Outside the directory falls back to the synthetic pages
+    (tmp_path / 'secret.htm').write_text('secret', encoding='utf-8')
+    assert FixtureServer(fixtures_dir=os.path.join('fx', 'Reviews')).render('/../../secret.htm') is None
+
+
+@pytest.mark.parametrize('kind', ['reviews', 'interviews'])
+def test_fixture_pages_parse_completely(kind):
+    html = render_page(kind, 2, 5, 10)
+    parse = review_parser.parse_reviews_html if kind == 'reviews' else interview_parser.parse_interviews_html
+    records = parse(html)
+    assert len(records) == 10
+    for record in records:
+        assert all(value is not None for value in record.values()), record
+
+
+@pytest.mark.parametrize('kind', ['reviews', 'interviews'])
+def test_page_past_the_end_is_empty(kind):
+    parse = review_parser.parse_reviews_html if kind == 'reviews' else interview_parser.parse_interviews_html
+    assert parse(render_page(kind, 6, 5, 10)) == []
@@ -0,0 +1,50 @@
+import json
+import os
+
+from html_cache import HtmlCache
+
+
+def blob_count(directory):
+    return sum(len(names) for _, _, names in os.walk(os.path.join(directory, 'objects')))
+
+
+def test_oldest_pages_are_evicted_over_the_limit(tmp_path):
+    cache = HtmlCache(str(tmp_path), max_bytes=10 ** 6)
+    for url in 'abcd':
+        cache.put(url, url * 1000)
+    cache.max_bytes = cache.total_bytes - 1
+    cache.put('a', 'a' * 1000)
+    # b was fetched longest ago now that a was fetched again
+    assert [url for url in 'abcd' if cache.get(url) is not None] == ['a', 'c', 'd']
+    assert blob_count(tmp_path) == 3
+    assert cache.total_bytes <= cache.max_bytes
+    cache.close()
+
+    reopened = HtmlCache(str(tmp_path))
+    assert list(reopened.index) == ['c', 'd', 'a']
+    assert reopened.get('d') == 'd' * 1000
+
+
+def test_identical_pages_share_a_blob(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('first', '<html>same</html>')
+    cache.put('second', '<html>same</html>')
+    assert blob_count(tmp_path) == 1
+    cache.put('first', '<html>changed</html>')
+    cache.put('second', '<html>changed</html>')
+    # Nothing references the old page anymore
+    assert blob_count(tmp_path) == 1
+    assert cache.total_bytes == os.path.getsize(cache._object_path(cache.index['first']['digest']))
+
+
+def test_json_index_is_imported(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put('page', '<html>old</html>')
+    entry = cache.index['page']
+    cache.close()
+    os.remove(tmp_path / 'index.db')
+    with open(tmp_path / 'index.json', 'w', encoding='utf-8') as f:
+        json.dump({'page': entry}, f)
+
+    assert HtmlCache(str(tmp_path)).get('page') == '<html>old</html>'
+    assert not os.path.exists(tmp_path / 'index.json')
@@ -0,0 +1,26 @@
+import pytest
+
+import reviews
+from http_backend import ChallengeDetected, find_challenge_marker
+
+
+def test_failed_page_is_skipped(fixture_server_factory, http_fetcher):
+    server = fixture_server_factory(total_pages=5, per_page=4, missing_pages={3})
+    records = reviews.get_all_reviews(server.reviews_url, None, workers=2, http_fetcher=http_fetcher)
+    assert len(records) == 16
+    # A 404 is not transient, so it is not retried
+    assert server.pages_served().count(3) == 1
+
+
+def test_page_without_container_is_a_challenge(fixture_server_factory, http_fetcher):
+    server = fixture_server_factory(total_pages=2, per_page=4)
+    reviews_page = server.reviews_url.replace('.htm', '_P1.htm')
+    interviews_page = server.interviews_url.replace('.htm', '_P1.htm')
+    assert 'id="ReviewsFeed"' in http_fetcher.get_html(reviews_page, container='id="ReviewsFeed"')
+    with pytest.raises(ChallengeDetected):
+        http_fetcher.get_html(interviews_page, container='id="ReviewsFeed"')
+
+
+def test_challenge_markers():
+    assert find_challenge_marker('<title>Just a moment...</title>') == 'Just a moment...'
+    assert find_challenge_marker('<div id="ReviewsFeed"></div>') is None
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+pytest.importorskip('webdriver_manager')
+
+import install_chromedriver  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """A cached chromedriver resolved for Chrome 120, with Chrome 120 installed."""
+    driver = tmp_path / 'chromedriver'
+    driver.write_text('')
+    cache_path = tmp_path / 'chromedriver.json'
+    cache_path.write_text(json.dumps({'path': str(driver), 'browser_version': '120.0.6099.109'}))
+    monkeypatch.setattr(install_chromedriver, 'CACHE_PATH', str(cache_path))
+    monkeypatch.setattr(install_chromedriver, 'get_chrome_version', lambda: '120.0.6099.224')
+    install_chromedriver.cached_chromedriver_path.cache_clear()
+    yield driver
+    install_chromedriver.cached_chromedriver_path.cache_clear()
+
+
+def test_cached_driver_is_used_while_the_chrome_major_version_matches(cache):
+    assert install_chromedriver.cached_chromedriver_path() == str(cache)
+
+
+def test_chrome_update_invalidates_the_cached_driver(cache, monkeypatch):
+    monkeypatch.setattr(install_chromedriver, 'get_chrome_version', lambda: '121.0.6167.85')
+    assert install_chromedriver.cached_chromedriver_path() is None
+
+
+def test_missing_driver_is_not_used(cache):
+    cache.unlink()
+    assert install_chromedriver.cached_chromedriver_path() is None
+
+
+def test_invalidate_cache_forgets_the_driver(cache):
+    assert install_chromedriver.cached_chromedriver_path() == str(cache)
+    install_chromedriver.invalidate_cache()
+    assert install_chromedriver.load_cache() is None
+    assert install_chromedriver.cached_chromedriver_path() is None
+
+
+def test_resolution_is_skipped_when_cached(cache, monkeypatch):
+    def resolve():
+        raise AssertionError('resolved chromedriver over the network')
+
+    monkeypatch.setattr(install_chromedriver, 'test_can_get_chrome_driver_with_custom_http_client', resolve)
+    assert install_chromedriver.get_chromedriver_path() == str(cache)
+
+
+def test_offline_falls_back_to_a_driver_for_another_version(cache, monkeypatch):
+    def resolve():
+        raise ConnectionError('offline')
+
+    monkeypatch.setattr(install_chromedriver, 'get_chrome_version', lambda: '121.0.6167.85')
+    monkeypatch.setattr(install_chromedriver, 'test_can_get_chrome_driver_with_custom_http_client', resolve)
+    assert install_chromedriver.get_chromedriver_path() == str(cache)
+
+
+def test_resolved_driver_is_cached(cache, tmp_path, monkeypatch):
+    install_chromedriver.invalidate_cache()
+    resolved = tmp_path / 'chromedriver-121'
+    resolved.write_text('')
+    monkeypatch.setattr(install_chromedriver, 'test_can_get_chrome_driver_with_custom_http_client',
+                        lambda: str(resolved))
+    assert install_chromedriver.get_chromedriver_path() == str(resolved)
+    assert install_chromedriver.load_cache()['browser_version'] == '120.0.6099.224'
+    assert install_chromedriver.cached_chromedriver_path() == str(resolved)
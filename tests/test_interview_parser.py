@@ -0,0 +1,39 @@
+import interview_parser
+from fixture_server import LOCATION_ICON
+
+INTERVIEW_BODY = (
+    '<h3>Software Engineer Interview</h3>'
+    '<span>Mar 2, 2023</span><span>Anonymous Interview Candidate</span>'
+    '<span>Accepted offer</span><span>Positive experience</span><span>Difficult interview</span>'
+    f'<div class="text-with-icon_TextWithIcon__5ZZqT">{LOCATION_ICON}London, England</div>'
+    '<p>Application</p><p>Applied online.</p><p>Interview</p><p>Two rounds of coding.</p>'
+    '<div data-test="question-container">'
+    '<div class="interview-details_interviewText__YH2ZO"><p>Reverse a list?</p></div>'
+    '<div class="interview-details_interviewText__YH2ZO"><p>Why us?</p></div></div>'
+    '<div data-test="review-helpful-count">Helpful (2)</div>'
+)
+# Glassdoor nests two divs with the same data-brandviews per interview
+INTERVIEW_HTML = (
+    '<div data-test="InterviewList">'
+    '<div data-brandviews="MODULE:n=interview-reviews:eid=1:id=7">'
+    '<div data-brandviews="MODULE:n=interview-reviews:eid=1:id=7">'
+    f'{INTERVIEW_BODY}</div></div></div>'
+    '<div>Showing 1 - 10 of 57 interviews</div>'
+)
+
+
+def test_parse_interview_fields():
+    [interview] = interview_parser.parse_interviews_html(INTERVIEW_HTML)
+    assert interview == {
+        'interview_position': 'Software Engineer Interview',
+        'location': 'London, England',
+        'published_date': 'Mar 2, 2023',
+        'candidate': 'Anonymous Interview Candidate',
+        'is_offer_received': 'Accepted offer',
+        'interview_experience': 'Positive experience',
+        'interview_difficulty': 'Difficult interview',
+        'application_process': 'Applied online.',
+        'interview_review': 'Two rounds of coding.',
+        'interview_questions': ['Reverse a list?', 'Why us?'],
+        'helpful_count': 'Helpful (2)',
+    }
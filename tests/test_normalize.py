@@ -0,0 +1,26 @@
+import datetime
+import logging
+
+from normalize import to_arrow_table
+
+
+def test_unparsed_values_are_kept_raw_and_logged_once(caplog):
+    records = [
+        {'published_date': 'Sept 5, 2024', 'interview_difficulty': 'Difficult interview'},
+        {'published_date': 'last week', 'interview_difficulty': 'Very difficult interview'},
+        {'published_date': 'last week', 'interview_difficulty': None},
+    ]
+    with caplog.at_level(logging.WARNING, logger='normalize'):
+        table = to_arrow_table('interviews', records).to_pydict()
+    assert table['published_date'] == [datetime.datetime(2024, 9, 5), None, None]
+    assert table['published_date_raw'] == [None, 'last week', 'last week']
+    assert table['interview_difficulty'] == ['Difficult interview', None, None]
+    assert table['interview_difficulty_raw'] == [None, 'Very difficult interview', None]
+    assert len([r for r in caplog.records if 'last week' in r.message]) == 1
+
+
+def test_converting_typed_output_again_keeps_raw_values():
+    table = to_arrow_table('reviews', [{'date': 'yesterday', 'recommend': 'Check'}])
+    again = to_arrow_table('reviews', table.to_pylist()).to_pydict()
+    assert (again['date'], again['date_raw']) == ([None], ['yesterday'])
+    assert (again['recommend'], again['recommend_raw']) == (['positive'], [None])
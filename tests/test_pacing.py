@@ -0,0 +1,67 @@
+import pytest
+
+import pacing
+from pacing import MIN_LOAD_TIME_SAMPLES, PROFILES, Pacer
+
+URL = 'https://www.glassdoor.com/Reviews/Acme-Reviews-E1_P1.htm'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(pacing.time, 'sleep', slept.append)
+    # Backoffs at the top of their random range
+    monkeypatch.setattr(pacing.random, 'uniform', lambda low, high: high)
+    return slept
+
+
+def test_timeout_follows_the_host_load_times():
+    pacer = Pacer('fast')
+    profile = PROFILES['fast']
+    for _ in range(MIN_LOAD_TIME_SAMPLES - 1):
+        pacer.loaded(URL, 2)
+    assert pacer.timeout(URL) == profile.initial_timeout
+    pacer.loaded(URL, 2)
+    assert pacer.timeout(URL) == 2 * profile.timeout_factor
+    # Other hosts keep their own samples
+    assert pacer.timeout('https://example.com/') == profile.initial_timeout
+
+
+def test_timeout_is_clamped():
+    pacer = Pacer('fast')
+    for _ in range(MIN_LOAD_TIME_SAMPLES):
+        pacer.loaded(URL, 0.01)
+        pacer.loaded('https://slow.example.com/', 60)
+    assert pacer.timeout(URL) == PROFILES['fast'].min_timeout
+    assert pacer.timeout('https://slow.example.com/') == PROFILES['fast'].max_timeout
+
+
+def test_throttling_backs_off_exponentially_and_recovers(sleeps):
+    pacer = Pacer('fast')
+    backoff = PROFILES['fast'].backoff
+    pacer.before_page(URL)
+    assert sleeps == []
+
+    pacer.throttled(URL, 'HTTP 429')
+    pacer.before_page(URL)
+    assert sleeps[-1] == pytest.approx(backoff, abs=0.05)
+
+    pacer._hosts['www.glassdoor.com'].resume_at = 0
+    pacer.throttled(URL, 'HTTP 429')
+    pacer.before_page(URL)
+    assert sleeps[-1] == pytest.approx(2 * backoff, abs=0.05)
+
+    # Each successful page eases the backoff by one step
+    pacer.loaded(URL, 1)
+    pacer._hosts['www.glassdoor.com'].resume_at = 0
+    pacer.throttled(URL)
+    pacer.before_page(URL)
+    assert sleeps[-1] == pytest.approx(2 * backoff, abs=0.05)
+
+
+def test_backoff_is_capped(sleeps):
+    pacer = Pacer('fast')
+    for _ in range(20):
+        pacer.throttled(URL)
+    pacer.before_page(URL)
+    assert sleeps[-1] == pytest.approx(PROFILES['fast'].max_backoff, abs=0.05)
@@ -0,0 +1,10 @@
+import interview_parser
+import review_parser
+
+
+def test_total_counts():
+    review_html = '<div>Showing <strong>1 - 10</strong> of <strong>1,234</strong> reviews</div>'
+    interview_html = '<div>Showing 1 - 10 of 57 interviews</div>'
+    assert review_parser.parse_total_count(review_parser.page_text(review_html)) == 1234
+    assert interview_parser.parse_total_count(interview_parser.page_text(interview_html)) == 57
+    assert review_parser.parse_total_count('No reviews yet') is None
@@ -0,0 +1,46 @@
+import reviews
+from crawler import crawl_pages
+from record_store import RecordStore, company_from_url, iso_date
+from sinks import MultiSink
+
+
+def test_incremental_crawl_stops_at_first_known_page(fixture_server_factory, http_fetcher, tmp_path):
+    server = fixture_server_factory(total_pages=5, per_page=3)
+    db_path = str(tmp_path / 'records.db')
+    with RecordStore(db_path, 'reviews', 'Benchmark') as record_store:
+        reviews.get_all_reviews(server.reviews_url, None, sink=MultiSink(record_store),
+                                http_fetcher=http_fetcher)
+    served = len(server.paths)
+
+    with RecordStore(db_path, 'reviews', 'Benchmark') as record_store:
+        records = reviews.get_all_reviews(server.reviews_url, None, sink=None, http_fetcher=http_fetcher,
+                                          is_last_page=record_store.is_known_page)
+    assert records == []
+    assert server.pages_served()[served:] == [1]
+
+
+def test_is_last_page_ends_the_crawl_early():
+    def fetch_page(page):
+        return [{'page': page}] if page <= 10 else []
+
+    records = crawl_pages(fetch_page, workers=3, is_last_page=lambda records: records[0]['page'] == 4)
+    assert [record['page'] for record in records] == [1, 2, 3]
+
+
+def test_known_page_needs_every_record_stored(tmp_path):
+    records = [{'review_title': 'Good', 'date': 'Jan 5, 2024'}, {'review_title': 'Bad', 'date': 'Feb 1, 2024'}]
+    with RecordStore(str(tmp_path / 'records.db'), 'reviews', 'Benchmark') as record_store:
+        record_store.write_page(1, records[:1])
+        assert not record_store.is_known_page(records)
+        record_store.write_page(2, records[1:])
+        assert record_store.is_known_page(records)
+        # Records are stored per company
+        other = RecordStore(str(tmp_path / 'records.db'), 'reviews', 'Other')
+        assert not other.is_known_page(records)
+        other.close()
+
+
+def test_company_and_date_keys():
+    assert company_from_url('https://www.glassdoor.com/Reviews/Acme-Reviews-E123_P4.htm') == 'Acme-Reviews-E123'
+    assert iso_date('Jan 5, 2024') == '2024-01-05'
+    assert iso_date('unknown') is None
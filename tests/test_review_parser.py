@@ -0,0 +1,66 @@
+import pytest
+from bs4 import BeautifulSoup
+
+import review_parser
+from fixture_server import LOCATION_ICON, STAR, STAR_OUTLINE
+from review_parser import SUBRATING_KEYS, predefined_svg_elements
+
+SUBRATING_STARS = (4, 3, 5, 2, 1, 3)
+
+REVIEW_HTML = (
+    '<div id="ReviewsFeed"><ol><li><div class="review-details_reviewDetails">'
+    '<div class="review-rating_ratingContainer__sQ_4_"><span>4.0</span><aside>'
+    + ''.join(f'<div class="review-rating_subRating__0Q_Z0"><div>{key}</div>'
+              + STAR * stars + STAR_OUTLINE * (5 - stars) + '</div>'
+              for key, stars in zip(SUBRATING_KEYS, SUBRATING_STARS))
+    + '<p>Popup paragraph</p></aside></div>'
+    '<span>Jan 5, 2024</span><span>-</span><span>Data Scientist</span>'
+    '<h3>Great place to learn</h3>'
+    '<div class="text-with-icon_TextWithIcon__5ZZqT">Current employee, more than 1 year</div>'
+    f'<div class="text-with-icon_TextWithIcon__5ZZqT">{LOCATION_ICON}Berlin</div>'
+    '<div class="review-details_experienceContainer__2W06X">'
+    f'<div>{predefined_svg_elements["Check"]}</div>'
+    f'<div>{predefined_svg_elements["Circle"]}</div>'
+    f'<div>{predefined_svg_elements["X"]}</div></div>'
+    '<p>Pros</p><p>Smart colleagues</p><p>Cons</p><p>Long meetings</p>'
+    '<div data-test="review-helpful-count">3 people found this helpful</div>'
+    '</div></li></ol></div>'
+    '<div>Showing <strong>1 - 10</strong> of <strong>1,234</strong> reviews</div>'
+)
+
+def test_parse_review_fields():
+    [review] = review_parser.parse_reviews_html(REVIEW_HTML)
+    assert review == {
+        'review_title': 'Great place to learn',
+        'employee_status': 'Current employee, more than 1 year',
+        'location': 'Berlin',
+        'pros': 'Smart colleagues',
+        'cons': 'Long meetings',
+        'rating': '4.0',
+        'date': 'Jan 5, 2024',
+        'position': 'Data Scientist',
+        'recommend': 'Check',
+        'ceo_approval': 'Circle',
+        'business_outlook': 'X',
+        **dict(zip(SUBRATING_KEYS, SUBRATING_STARS)),
+        'helpful_count': '3 people found this helpful',
+    }
+
+
+def test_review_without_popup_has_no_subratings():
+    html = REVIEW_HTML.split('<aside>')[0] + '</div>' + REVIEW_HTML.split('</aside></div>')[1]
+    [review] = review_parser.parse_reviews_html(html)
+    assert all(review[key] is None for key in SUBRATING_KEYS)
+    assert review['date'] == 'Jan 5, 2024'
+    assert review_parser.is_missing_subratings(review_parser.get_review_items(html)[0], review)
+
+
+@pytest.mark.parametrize('name', sorted(predefined_svg_elements))
+def test_icons_are_classified_whatever_the_attribute_order(name):
+    svg_markup = predefined_svg_elements[name].replace('width="24" height="24"', 'height="24" width="24"')
+    assert review_parser.classify_svg(BeautifulSoup(svg_markup, 'html.parser').svg) == name
+
+
+def test_unknown_icon_is_none():
+    svg = BeautifulSoup('<svg><rect width="1"></rect></svg>', 'html.parser').svg
+    assert review_parser.classify_svg(svg) is None
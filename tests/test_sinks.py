@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import reviews
+from crawler import crawl_pages
+from sinks import Checkpoint, open_sink
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_pages_are_written_in_page_order(fixture_server_factory, http_fetcher, tmp_path):
+    server = fixture_server_factory(total_pages=6, per_page=3)
+    path = str(tmp_path / 'reviews.jsonl')
+    checkpoint = Checkpoint(path + '.checkpoint.json', server.reviews_url)
+    with open_sink(path) as sink:
+        reviews.get_all_reviews(server.reviews_url, None, workers=4, sink=sink, checkpoint=checkpoint,
+                                http_fetcher=http_fetcher)
+    expected = reviews.get_all_reviews(server.reviews_url, None, http_fetcher=http_fetcher)
+    assert read_jsonl(path) == expected
+    assert checkpoint.completed_pages == set(range(1, 7))
+
+
+def test_resume_fetches_only_missing_pages(fixture_server_factory, http_fetcher, tmp_path):
+    path = str(tmp_path / 'reviews.jsonl')
+    checkpoint_path = path + '.checkpoint.json'
+    first = fixture_server_factory(total_pages=7, per_page=2, missing_pages={4})
+    checkpoint = Checkpoint(checkpoint_path, first.reviews_url)
+    with open_sink(path) as sink:
+        reviews.get_all_reviews(first.reviews_url, None, sink=sink, checkpoint=checkpoint,
+                                http_fetcher=http_fetcher)
+    assert checkpoint.completed_pages == {1, 2, 3, 5, 6, 7}
+
+    second = fixture_server_factory(total_pages=7, per_page=2)
+    # The checkpoint is tied to the listing URL, which includes the port
+    with open(checkpoint_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['url'] = second.reviews_url
+    with open(checkpoint_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    checkpoint = Checkpoint(checkpoint_path, second.reviews_url, resume=True)
+    with open_sink(path, append=True, offset=checkpoint.offset) as sink:
+        reviews.get_all_reviews(second.reviews_url, None, sink=sink, checkpoint=checkpoint,
+                                http_fetcher=http_fetcher)
+    assert second.pages_served() == [4]
+    assert len(read_jsonl(path)) == 14
+    assert checkpoint.completed_pages == set(range(1, 8))
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'csv'])
+def test_resume_truncates_rows_written_after_the_checkpoint(extension, tmp_path):
+    path = str(tmp_path / f'out.{extension}')
+    checkpoint = Checkpoint(path + '.checkpoint.json', 'listing')
+    with open_sink(path) as sink:
+        crawl_pages(lambda page: [{'page': page}] if page <= 3 else [], sink=sink, checkpoint=checkpoint)
+    with open(path, encoding='utf-8') as f:
+        complete = f.read()
+    # A crash after page 4 was flushed but before it was checkpointed
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"page": 4}\n' if extension == 'jsonl' else '4\n')
+
+    checkpoint = Checkpoint(path + '.checkpoint.json', 'listing', resume=True)
+    open_sink(path, append=True, offset=checkpoint.offset).close()
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == complete